@@ -1,10 +1,30 @@
+import functools
+import json
 import os
-from typing import Any, Optional
+from typing import Any, Dict, Optional, cast
 
 import yaml
 from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# libyaml's C loader parses several times faster than the pure-Python one; fall
+# back to the latter where PyYAML was built without libyaml.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_file(path: str, mtime_ns: int) -> Optional[Dict[str, Any]]:
+    """
+    Parses a config file: JSON if its name ends in '.json', YAML otherwise.
+    Results are cached by path and modification time, so repeated Settings for
+    an unchanged file skip the parse, while an edited file is read again.
+    Callers must not modify the returned mapping.
+    """
+    with open(path, "r") as f:
+        if path.lower().endswith(".json"):
+            return cast(Optional[Dict[str, Any]], json.load(f))
+        return cast(Optional[Dict[str, Any]], yaml.load(f, Loader=_YAML_LOADER))
+
 
 class DatabaseSettings(BaseSettings):
     """Models database connection settings."""
@@ -33,6 +53,14 @@ class SporApiSettings(BaseSettings):
     tenancy_name: str = "default"
     username: str = "user"
     password: SecretStr = SecretStr("password")
+    # Maximum number of lookups kept in memory, organisations and substances
+    # together, including cached misses.
+    cache_maxsize: int = Field(default=10_000, ge=1)
+    # Seconds before a name without a match is looked up again.
+    negative_cache_ttl: float = Field(default=3600, ge=0)
+    # Seconds before a name whose lookup failed, e.g. during an outage, is
+    # looked up again.
+    failure_cache_ttl: float = Field(default=60, ge=0)
 
     model_config = SettingsConfigDict(env_prefix="PY_LOAD_EPAR_SPOR_")
 
@@ -54,6 +82,10 @@ class EtlSettings(BaseSettings):
     load_strategy: str = "DELTA"  # or "FULL"
     batch_size: int = 1000
     max_retries: int = 5
+    # Number of threads downloading EPAR documents at the same time
+    download_concurrency: int = Field(default=16, ge=1)
+    # Optional SQLite file remembering downloaded documents across runs
+    document_cache_path: Optional[str] = None
     epar_data_url: str = Field(
         default="https://www.ema.europa.eu/en/documents/report/medicines-output-medicines-report_en.xlsx",
         description="URL to the main EMA EPAR index file (Excel/CSV).",
@@ -70,7 +102,7 @@ class Settings(BaseSettings):
     spor_api: SporApiSettings = SporApiSettings()
     storage: StorageSettings = StorageSettings()
 
-    # Optional path to a YAML config file
+    # Optional path to a YAML (or JSON) config file
     config_path: Optional[str] = None
 
     def __init__(self, config_path: Optional[str] = None, **values: Any):
@@ -85,13 +117,15 @@ class Settings(BaseSettings):
 
     def _load_from_yaml(self) -> None:
         """
-        Loads and merges settings from a YAML file, giving precedence to environment variables.
+        Loads and merges settings from a YAML (or JSON) file, giving precedence to
+        environment variables.
         """
         if not self.config_path:
             return
 
-        with open(self.config_path, "r") as f:
-            yaml_config = yaml.safe_load(f)
+        yaml_config = _load_config_file(
+            self.config_path, os.stat(self.config_path).st_mtime_ns
+        )
 
         if not yaml_config:
             return
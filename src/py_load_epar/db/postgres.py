@@ -12,6 +12,12 @@ from py_load_epar.db.interfaces import IDatabaseAdapter
 
 logger = logging.getLogger(__name__)
 
+# Characters that must be backslash-escaped in COPY's text format, applied in a
+# single str.translate pass.
+_COPY_TEXT_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+)
+
 
 class PostgresAdapter(IDatabaseAdapter):
     """
@@ -55,7 +61,11 @@ class PostgresAdapter(IDatabaseAdapter):
     def prepare_load(self, load_strategy: str, target_table: str) -> str:
         """
         Prepare the database for loading. For 'FULL', truncates the table.
-        For 'DELTA', creates an unlogged staging table.
+        For 'DELTA', creates a temporary staging table.
+
+        The staging table is private to this connection and is not WAL-logged,
+        so concurrent DELTA runs cannot clash over it. It outlives intermediate
+        commits and is dropped by `finalize`.
         """
         if not self.conn:
             raise ConnectionError("Database connection is not established.")
@@ -70,13 +80,13 @@ class PostgresAdapter(IDatabaseAdapter):
             elif load_strategy.upper() == "DELTA":
                 staging_table = f"staging_{target_table}"
                 logger.info(
-                    "DELTA load strategy: Creating UNLOGGED staging table "
+                    "DELTA load strategy: Creating temporary staging table "
                     f"{staging_table}."
                 )
                 cursor.execute(f"DROP TABLE IF EXISTS {staging_table};")
                 cursor.execute(
                     (
-                        f"CREATE UNLOGGED TABLE {staging_table} "
+                        f"CREATE TEMP TABLE {staging_table} "
                         f"(LIKE {target_table} INCLUDING DEFAULTS);"
                     )
                 )
@@ -236,13 +246,7 @@ class PostgresAdapter(IDatabaseAdapter):
         """Formats Python values for text-based COPY."""
         if value is None:
             return "\\N"
-        value_str = str(value)
-        return (
-            value_str.replace("\\", "\\\\")
-            .replace("\n", "\\n")
-            .replace("\r", "\\r")
-            .replace("\t", "\\t")
-        )
+        return str(value).translate(_COPY_TEXT_ESCAPES)
 
     def get_latest_high_water_mark(self) -> Optional[datetime.datetime]:
         """
@@ -0,0 +1,102 @@
+import datetime
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from types import TracebackType
+from typing import Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentCache:
+    """
+    A persistent record of the documents already downloaded.
+
+    EMA republishes revised documents at the same URL, so an entry is only
+    reused while the EPAR record's source revision date is unchanged, and only
+    for the storage target the document was saved to. A hit skips downloading,
+    hashing and storing the document again. Entries are kept in a local SQLite
+    file; lookups and inserts are safe to call from the download thread pool.
+
+    Args:
+        path: The SQLite file holding the cache.
+        storage_target: Identifies where documents are stored, e.g. the S3
+            bucket or local directory URI.
+    """
+
+    def __init__(self, path: str | Path, storage_target: str):
+        self.path = Path(path)
+        self.storage_target = storage_target
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS document_downloads ("
+                "url TEXT NOT NULL, "
+                "storage_target TEXT NOT NULL, "
+                "revision TEXT NOT NULL, "
+                "storage_uri TEXT NOT NULL, "
+                "file_hash TEXT NOT NULL, "
+                "PRIMARY KEY (url, storage_target))"
+            )
+        logger.info(f"Using document cache at: {self.path}")
+
+    def get(self, url: str, revision: datetime.date) -> Optional[Tuple[str, str]]:
+        """
+        Looks up a previously downloaded document.
+
+        Args:
+            url: The URL the document was downloaded from.
+            revision: The source revision date of the EPAR record linking to it.
+
+        Returns:
+            A tuple of the document's storage URI and SHA-256 hash, or None if
+            the URL has not been downloaded to this storage target for this
+            revision.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT storage_uri, file_hash FROM document_downloads "
+                "WHERE url = ? AND storage_target = ? AND revision = ?",
+                (url, self.storage_target, revision.isoformat()),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(
+        self, url: str, revision: datetime.date, storage_uri: str, file_hash: str
+    ) -> None:
+        """
+        Records a downloaded document, replacing any earlier revision of it
+        held for this storage target.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO document_downloads "
+                "(url, storage_target, revision, storage_uri, file_hash) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    url,
+                    self.storage_target,
+                    revision.isoformat(),
+                    storage_uri,
+                    file_hash,
+                ),
+            )
+
+    def close(self) -> None:
+        """Closes the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "DocumentCache":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
@@ -1,18 +1,192 @@
+import contextlib
 import hashlib
 import io
 import logging
-from typing import IO, Tuple
+import queue
+import threading
+from typing import IO, TYPE_CHECKING, Any, Iterator, Tuple, cast
 
 import requests
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from py_load_epar.storage.interfaces import IStorage
 
+if TYPE_CHECKING:
+    from _typeshed import WriteableBuffer
+
 logger = logging.getLogger(__name__)
 
 # The official URL for the EMA medicines data Excel file
 EMA_EXCEL_URL = "https://www.ema.europa.eu/en/documents/report/medicines-output-medicines-report_en.xlsx"
 
+# (connect, read) timeouts in seconds for all downloads
+DOWNLOAD_TIMEOUT = (5, 60)
+
+# Downloads are streamed in 1 MiB chunks; larger reads keep hashing and storage
+# writes cheap relative to the network transfer.
+DOCUMENT_CHUNK_SIZE = 1024 * 1024
+
+# Number of downloaded chunks that may wait for the storage adapter to consume
+# them, bounding the memory used by the download/upload pipeline.
+PREFETCH_DEPTH = 4
+
+# Seconds to wait for the prefetch thread to finish once its consumer is done.
+PREFETCH_JOIN_TIMEOUT = 1.0
+
+# Documents whose declared size is below this are read in one go instead of
+# being streamed through the prefetch thread.
+SMALL_BODY_BYTES = 2 * 1024 * 1024
+
+_END_OF_STREAM = object()
+
+
+def _build_session() -> requests.Session:
+    """
+    Builds the HTTP session shared by all downloads.
+
+    Reusing one session keeps connections alive between downloads instead of
+    paying for a new TCP/TLS handshake each time. The adapter does not retry;
+    the tenacity decorators below retry each download as a whole, which also
+    covers failures partway through the body.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = _build_session()
+
+
+def get_session() -> requests.Session:
+    """Returns the pooled HTTP session shared by all downloads."""
+    return _SESSION
+
+
+def _put_until_stopped(
+    buffer: "queue.Queue[Any]", item: Any, stop: threading.Event
+) -> bool:
+    """Puts an item on the buffer, giving up if `stop` is set while it is full."""
+    while not stop.is_set():
+        try:
+            buffer.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _fill_buffer(
+    chunks: Iterator[bytes], buffer: "queue.Queue[Any]", stop: threading.Event
+) -> None:
+    """
+    Moves chunks onto the buffer, followed by _END_OF_STREAM or the error that
+    ended the read. Stops between chunks once `stop` is set.
+    """
+    try:
+        for chunk in chunks:
+            if stop.is_set() or not _put_until_stopped(buffer, chunk, stop):
+                return
+    except BaseException as e:
+        _put_until_stopped(buffer, e, stop)
+        return
+    _put_until_stopped(buffer, _END_OF_STREAM, stop)
+
+
+def _drain_buffer(buffer: "queue.Queue[Any]") -> Iterator[bytes]:
+    """Yields the buffered chunks, re-raising the error that ended the read."""
+    while True:
+        item = buffer.get()
+        if item is _END_OF_STREAM:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
+
+
+@contextlib.contextmanager
+def _prefetched(
+    chunks: Iterator[bytes], depth: int = PREFETCH_DEPTH
+) -> Iterator[Iterator[bytes]]:
+    """
+    Reads chunks on a background thread into a bounded queue, so the network
+    transfer overlaps with hashing and storage writes on the calling thread.
+
+    Errors raised while reading are re-raised to the consumer. On exit the
+    reader thread is told to stop. A reader blocked on the socket only notices
+    once the response is closed, after this returns, so the wait for it is
+    capped at PREFETCH_JOIN_TIMEOUT seconds.
+    """
+    buffer: queue.Queue[Any] = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    producer = threading.Thread(
+        target=_fill_buffer,
+        args=(chunks, buffer, stop),
+        name="document-prefetch",
+        daemon=True,
+    )
+    producer.start()
+    try:
+        yield _drain_buffer(buffer)
+    finally:
+        stop.set()
+        producer.join(PREFETCH_JOIN_TIMEOUT)
+
+
+def _is_small_body(response: requests.Response) -> bool:
+    """Returns True if the response declares a body smaller than SMALL_BODY_BYTES."""
+    content_length = response.headers.get("Content-Length")
+    try:
+        return content_length is not None and int(content_length) < SMALL_BODY_BYTES
+    except ValueError:
+        return False
+
+
+class _HashingReader(io.RawIOBase):
+    """
+    A read-only, forward-only stream over downloaded chunks that updates a
+    SHA-256 hash as the chunks are consumed.
+
+    This lets a storage adapter read the document straight from the network
+    response while the hash is calculated in the same pass, so the document is
+    never held in memory as a whole.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = memoryview(b"")
+        self._position = 0
+        self.hasher = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        # Storage adapters rewind the stream before reading it; that is a no-op
+        # as long as nothing has been read yet.
+        if whence == io.SEEK_SET and offset == self._position == 0:
+            return 0
+        raise io.UnsupportedOperation("Document stream is not seekable.")
+
+    def readinto(self, b: "WriteableBuffer") -> int:
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self.hasher.update(chunk)
+            self._buffer = memoryview(chunk)
+        target = memoryview(b).cast("B")
+        size = min(len(target), len(self._buffer))
+        target[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        self._position += size
+        return size
+
 
 @retry(
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -29,9 +203,11 @@ def _download_file_to_stream(url: str, file_stream: IO[bytes]) -> None:
     """
     logger.info(f"Attempting to download file from: {url}")
     try:
-        with requests.get(url, stream=True, timeout=60) as response:
+        with _SESSION.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
             response.raise_for_status()
-            for chunk in response.iter_content(chunk_size=8192):
+            # Copy in large blocks; iter_content turns urllib3 errors raised
+            # partway through the body into requests exceptions.
+            for chunk in response.iter_content(chunk_size=DOCUMENT_CHUNK_SIZE):
                 file_stream.write(chunk)
     except requests.exceptions.RequestException as e:
         logger.error(f"Failed to download file from {url}: {e}")
@@ -55,14 +231,66 @@ def download_file_to_memory(url: str) -> io.BytesIO:
     return memory_file
 
 
+@retry(
+    wait=wait_exponential(multiplier=1, min=4, max=10),
+    stop=stop_after_attempt(5),
+    reraise=True,
+)
+def _stream_document_to_storage(
+    url: str, storage: IStorage, object_name: str
+) -> Tuple[str, str]:
+    """
+    Streams a document from a URL into a storage adapter with retry logic,
+    hashing it on the way through.
+
+    Each attempt restarts the download and overwrites the stored object. Small
+    documents are read in a single pass and saved from memory, which skips the
+    overhead of the streaming pipeline.
+
+    Args:
+        url: The URL of the document to download.
+        storage: The storage adapter to save the document with.
+        object_name: The name of the object in the storage backend.
+
+    Returns:
+        A tuple containing the storage URI of the saved file and its SHA-256 hash.
+    """
+    logger.info(f"Attempting to download file from: {url}")
+    try:
+        with _SESSION.get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            if _is_small_body(response):
+                body = response.content
+                storage_uri = storage.save(
+                    data_stream=io.BytesIO(body), object_name=object_name
+                )
+                return storage_uri, hashlib.sha256(body).hexdigest()
+            with _prefetched(
+                response.iter_content(chunk_size=DOCUMENT_CHUNK_SIZE)
+            ) as chunks:
+                reader = _HashingReader(chunks)
+                storage_uri = storage.save(
+                    data_stream=cast(IO[bytes], reader), object_name=object_name
+                )
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Failed to download file from {url}: {e}")
+        raise
+    return storage_uri, reader.hasher.hexdigest()
+
+
 def download_document_and_hash(
     url: str, storage: IStorage, object_name_prefix: str = "documents"
 ) -> Tuple[str, str]:
     """
-    Downloads a document to memory, calculates its hash, and saves it via a
-    storage adapter.
+    Downloads a document, calculates its hash, and saves it via a storage
+    adapter.
 
-    The object name is derived from the URL's filename.
+    The document is streamed from the response into the storage adapter in
+    chunks, and the hash is calculated as the chunks pass through, so the whole
+    file is never buffered in memory. Chunks are downloaded on a background
+    thread while earlier ones are hashed and saved. Documents smaller than
+    SMALL_BODY_BYTES are read into memory in one go instead. The object name is
+    derived from the URL's filename.
 
     Args:
         url: The URL of the document to download.
@@ -72,26 +300,10 @@ def download_document_and_hash(
     Returns:
         A tuple containing the storage URI of the saved file and its SHA-256 hash.
     """
-    hasher = hashlib.sha256()
-    filename = url.split("/")[-1] or "downloaded_document"
+    filename = url[url.rfind("/") + 1 :] or "downloaded_document"
     object_name = f"{object_name_prefix}/{filename}"
 
-    # 1. Download the file into an in-memory stream
-    memory_file = download_file_to_memory(url)
-
-    # 2. Calculate the hash from the in-memory stream
-    # Iterate over the stream in chunks to avoid loading the whole file into
-    # memory again
-    memory_file.seek(0)
-    for chunk in iter(lambda: memory_file.read(4096), b""):
-        hasher.update(chunk)
-    file_hash = hasher.hexdigest()
-
-    # Rewind the stream again before passing it to the storage adapter
-    memory_file.seek(0)
-
-    # 3. Use the storage adapter to save the file
-    storage_uri = storage.save(data_stream=memory_file, object_name=object_name)
+    storage_uri, file_hash = _stream_document_to_storage(url, storage, object_name)
 
     logger.info(
         f"Processed document from {url}, stored at {storage_uri} with hash {file_hash}"
@@ -1,6 +1,7 @@
 import datetime
 import datetime
 import logging
+import warnings
 from typing import Any, Dict, Iterator
 
 import pandas as pd
@@ -11,6 +12,81 @@ from py_load_epar.etl.parser import parse_ema_excel_file
 logger = logging.getLogger(__name__)
 
 
+def _parse_dates(raw_dates: pd.Series) -> pd.Series:
+    """
+    Coerces a column of raw date values to `datetime.date` objects.
+
+    The column is parsed in one vectorised call where possible. Columns that
+    pandas cannot hold in a single datetime64 dtype (e.g. tz-aware values mixed
+    with naive ones, or different UTC offsets) fall back to coercing each value
+    on its own, keeping the local date of every value.
+
+    Args:
+        raw_dates: The raw date values.
+
+    Returns:
+        An object Series holding a `datetime.date` for each parseable value and
+        None for missing or unparseable ones.
+    """
+    # 'mixed' parses each value on its own, so datetimes and strings in different
+    # formats can share the column.
+    try:
+        with warnings.catch_warnings():
+            # Mixed offsets only warn today and will raise in a future pandas;
+            # both cases are handled by the per-value fallback below.
+            warnings.simplefilter("ignore", FutureWarning)
+            dates = pd.to_datetime(raw_dates, errors="coerce", format="mixed")
+    except (ValueError, TypeError):
+        dates = None
+
+    if dates is not None and pd.api.types.is_datetime64_any_dtype(dates):
+        return dates.dt.date.astype(object).where(dates.notna(), None)
+
+    def _to_date(value: Any) -> datetime.date | None:
+        parsed = pd.to_datetime(value, errors="coerce")
+        return None if pd.isna(parsed) else parsed.date()
+
+    return (
+        raw_dates.map(_to_date, na_action="ignore")
+        .astype(object)
+        .where(raw_dates.notna(), None)
+    )
+
+
+def _drop_invalid_records(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Validates the fields that extraction depends on column by column, logging and
+    dropping records that cannot be processed.
+
+    - Records without an 'active_substance' are skipped.
+    - 'marketing_authorisation_date' is coerced to a date; records with a value
+      that cannot be parsed are skipped, and missing values become None.
+
+    Args:
+        df: The deduplicated source records.
+
+    Returns:
+        The remaining records, with 'marketing_authorisation_date' coerced.
+    """
+    substances = df.get("active_substance", pd.Series(None, index=df.index))
+    missing_substance = substances.isna()
+    for record in df.loc[missing_substance].to_dict("records"):
+        logger.warning(f"Record missing 'active_substance'. Skipping. Record: {record}")
+
+    raw_dates = df.get("marketing_authorisation_date", pd.Series(None, index=df.index))
+    dates = _parse_dates(raw_dates)
+    unparseable = raw_dates.notna() & dates.isna() & ~missing_substance
+    for value in raw_dates[unparseable]:
+        logger.warning(
+            f"Could not parse marketing_authorisation_date '{value}'. Skipping record."
+        )
+
+    valid = ~(missing_substance | unparseable)
+    df = df.loc[valid].copy()
+    df["marketing_authorisation_date"] = dates[valid]
+    return df
+
+
 def extract_data(  # noqa: C901
     settings: Settings, high_water_mark: datetime.datetime | None = None
 ) -> Iterator[Dict[str, Any]]:
@@ -19,8 +95,9 @@ def extract_data(  # noqa: C901
 
     1. Downloads the main EMA data file into memory.
     2. Parses the in-memory Excel file into a stream of dictionaries.
-    3. Remaps and cleans raw dictionary keys to match Pydantic model fields.
-    4. Filters records based on the high_water_mark for Change Data Capture (CDC).
+    3. Drops records with a missing substance or an unparseable authorisation date.
+    4. Remaps and cleans raw dictionary keys to match Pydantic model fields.
+    5. Filters records based on the high_water_mark for Change Data Capture (CDC).
 
     Args:
         settings: The application settings, containing the URL for the data file.
@@ -59,6 +136,8 @@ def extract_data(  # noqa: C901
     # Drop duplicates on product number, keeping the last (most recent)
     df.drop_duplicates(subset=["product_number"], keep="last", inplace=True)
 
+    df = _drop_invalid_records(df)
+
     processed_count = 0
     for record in df.to_dict("records"):
         # --- Field renaming and type conversion ---
@@ -67,23 +146,6 @@ def extract_data(  # noqa: C901
         # The Pydantic model expects 'last_update_date_source'
         record["last_update_date_source"] = record_date
 
-        # Coerce 'marketing_authorisation_date' to a date object, skipping
-        # the record on failure.
-        auth_date_val = record.get("marketing_authorisation_date")
-        if pd.notna(auth_date_val):
-            # pd.to_datetime can handle various formats including existing datetimes
-            coerced_date = pd.to_datetime(auth_date_val, errors="coerce")
-            if pd.notna(coerced_date):
-                record["marketing_authorisation_date"] = coerced_date.date()
-            else:
-                logger.warning(
-                    f"Could not parse marketing_authorisation_date "
-                    f"'{auth_date_val}'. Skipping record."
-                )
-                continue
-        else:
-            record["marketing_authorisation_date"] = None
-
         # Rename keys from parser output to match Pydantic model fields
         if "authorisation_status" in record:
             record["authorization_status"] = record.pop("authorisation_status")
@@ -92,12 +154,7 @@ def extract_data(  # noqa: C901
             record["marketing_authorization_holder_raw"] = record.pop(
                 "marketing_authorisation_holder_company_name"
             )
-        record["active_substance_raw"] = record.pop("active_substance", None)
-        if record["active_substance_raw"] is None:
-            logger.warning(
-                f"Record missing 'active_substance'. Skipping. Record: {record}"
-            )
-            continue
+        record["active_substance_raw"] = record.pop("active_substance")
 
         # The 'URL' column is snake_cased to 'u_r_l' by the parser.
         if "u_r_l" in record:
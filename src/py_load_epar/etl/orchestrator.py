@@ -1,18 +1,34 @@
+import contextlib
 import datetime
+import itertools
 import logging
+import re
 import uuid
-from typing import Iterator, List, TypeVar
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 from urllib.parse import urljoin
 
-import pandas as pd
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from py_load_epar.config import Settings
+from py_load_epar.config import Settings, StorageSettings
 from py_load_epar.db.factory import get_db_adapter
 from py_load_epar.db.interfaces import IDatabaseAdapter
-from py_load_epar.etl.downloader import download_document_and_hash
+from py_load_epar.etl.document_cache import DocumentCache
+from py_load_epar.etl.downloader import download_document_and_hash, get_session
 from py_load_epar.etl.extract import extract_data
 from py_load_epar.etl.transform import transform_and_validate
 from py_load_epar.models import (
@@ -30,6 +46,25 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# Document downloads are I/O bound, so they run on a pool of threads.
+MAX_DOWNLOAD_WORKERS = 16
+
+# Link texts that identify the documents worth downloading from a summary page.
+_PDF_LINK_RE = re.compile(
+    r"public assessment report|smpc|product information|package leaflet|epar",
+    re.IGNORECASE,
+)
+
+# Pages that never mention ".pdf" cannot link to a PDF, so they are not parsed.
+_PDF_MENTION_RE = re.compile(rb"\.pdf", re.IGNORECASE)
+
+# Anchors whose href ends in ".pdf" (case-insensitively), compiled once so the
+# filter runs inside libxml2 rather than in Python.
+_PDF_ANCHORS_XPATH = etree.XPath(
+    "//a[substring(translate(@href, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', "
+    "'abcdefghijklmnopqrstuvwxyz'), string-length(@href) - 3) = '.pdf']"
+)
+
 
 def _batch_iterator(iterator: Iterator[T], batch_size: int) -> Iterator[List[T]]:
     """Yields batches of a given size from an iterator."""
@@ -140,10 +175,13 @@ def _process_substances(adapter: IDatabaseAdapter, substances: List[Substance])
 def _fetch_html_with_retry(url: str) -> bytes:
     """
     Fetches HTML content from a URL with a robust retry mechanism.
+
+    Pages are fetched over the same pooled session as the document downloads,
+    so connections to the EMA site are kept alive across records.
     """
     logger.debug(f"Fetching EPAR page: {url}")
     try:
-        response = requests.get(url, timeout=30)
+        response = get_session().get(url, timeout=30)
         response.raise_for_status()
         return response.content
     except requests.exceptions.RequestException as e:
@@ -151,94 +189,165 @@ def _fetch_html_with_retry(url: str) -> bytes:
         raise
 
 
+def _find_document_links(html_content: bytes, page_url: str) -> List[Tuple[str, str]]:
+    """
+    Parses an EPAR summary page and returns the link text and absolute URL of
+    every relevant document (e.g., Public Assessment Report) it links to.
+    """
+    # Only pages that mention a PDF are parsed; XPath then picks out the PDF links
+    if not _PDF_MENTION_RE.search(html_content):
+        return []
+    documents = []
+    for link in _PDF_ANCHORS_XPATH(lxml.html.fromstring(html_content)):
+        link_text = link.text_content().strip().lower()
+        if _PDF_LINK_RE.search(link_text):
+            documents.append((link_text, urljoin(page_url, link.get("href"))))
+    return documents
+
+
+def _storage_target(settings: StorageSettings) -> str:
+    """Identifies where the configured storage backend saves documents."""
+    if settings.backend.lower() == "s3":
+        return f"s3://{settings.s3_bucket}"
+    return Path(settings.local_storage_path).resolve().as_uri()
+
+
+def _download_document(
+    record: EparIndex,
+    link_text: str,
+    doc_url: str,
+    storage: IStorage,
+    document_cache: Optional[DocumentCache] = None,
+) -> EparDocument:
+    """
+    Downloads a single document and builds its EparDocument record. Documents
+    already recorded in the document cache are not downloaded again.
+    """
+    revision = record.last_update_date_source
+    cached = document_cache.get(doc_url, revision) if document_cache else None
+    if cached:
+        storage_uri, file_hash = cached
+        logger.info(f"Reusing cached document {storage_uri} for {doc_url}")
+    else:
+        storage_uri, file_hash = download_document_and_hash(
+            url=doc_url, storage=storage
+        )
+        if document_cache:
+            document_cache.put(doc_url, revision, storage_uri, file_hash)
+    return EparDocument(
+        document_id=uuid.uuid4(),
+        epar_id=record.epar_id,
+        document_type=link_text,
+        language_code="en",
+        source_url=doc_url,
+        storage_location=storage_uri,
+        file_hash=file_hash,
+        download_timestamp=datetime.datetime.now(datetime.timezone.utc),
+    )
+
+
+def _fetch_pages_ahead(
+    executor: ThreadPoolExecutor,
+    pages: Iterable[Tuple[EparIndex, str]],
+    window: int,
+) -> Iterator[Tuple[EparIndex, str, Future[bytes]]]:
+    """
+    Yields the summary page fetches of `pages` in order, keeping at most `window`
+    of them queued on the executor. A fetch is forgotten once it is yielded, so
+    its HTML can be released as soon as the caller has parsed it.
+    """
+    pages = iter(pages)
+    in_flight: Deque[Tuple[EparIndex, str, Future[bytes]]] = deque()
+    while True:
+        for record, page_url in itertools.islice(pages, window - len(in_flight)):
+            future = executor.submit(_fetch_html_with_retry, page_url)
+            in_flight.append((record, page_url, future))
+        if not in_flight:
+            return
+        yield in_flight.popleft()
+
+
 def _process_documents(
     adapter: IDatabaseAdapter,
     processed_records: List[EparIndex],
     storage: IStorage,
+    max_workers: int = MAX_DOWNLOAD_WORKERS,
+    document_cache: Optional[DocumentCache] = None,
 ) -> int:
     """
     Downloads, hashes, and loads metadata for associated documents.
     It fetches the EPAR summary page, parses the HTML to find links to
     relevant documents (e.g., Public Assessment Report), and then downloads them.
+    Summary pages and documents are fetched concurrently on one bounded thread
+    pool. Only `max_workers` page fetches are queued ahead at a time, so the
+    downloads found on a page wait behind that window rather than behind every
+    remaining page, and each page's HTML is released once it has been parsed.
     """
     logger.info("Starting document processing and HTML parsing.")
     document_records = []
-    # Define keywords to identify relevant documents
-    DOCUMENT_KEYWORDS = [
-        "public assessment report",
-        "smpc",
-        "product information",
-        "package leaflet",
-        "epar",
-    ]
 
-    for record in processed_records:
-        if not record.source_url or not record.source_url.startswith("http"):
-            continue
-
-        try:
-            # 1. Fetch the HTML of the EPAR summary page with retry
-            html_content = _fetch_html_with_retry(record.source_url)
-            soup = BeautifulSoup(html_content, "html.parser")
-            links = soup.find_all("a", href=True)
-            found_docs_for_record = False
-
-        except requests.exceptions.RequestException as e:
-            logger.error(
-                f"Failed to fetch or parse HTML for EPAR {record.epar_id} "
-                f"from {record.source_url}: {e}"
-            )
-            continue  # Skip to the next record
-
-        # 3. Find and process all relevant document links
-        for link in links:
+    pages = (
+        (record, record.source_url)
+        for record in processed_records
+        if record.source_url and record.source_url.startswith("http")
+    )
+    # Document downloads in flight, as (record, future of its EparDocument)
+    download_futures: List[Tuple[EparIndex, Future[EparDocument]]] = []
+    # Records whose summary page was fetched, with their count of downloaded docs
+    downloaded_docs_per_record: Dict[str, int] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 1. Fetch the HTML of the EPAR summary pages concurrently, with retry
+        for record, page_url, page_future in _fetch_pages_ahead(
+            executor, pages, window=max_workers
+        ):
             try:
-                link_text = link.get_text(strip=True).lower()
-                href = link["href"]
-
-                # Check if link text contains keywords and points to a PDF
-                if any(
-                    keyword in link_text for keyword in DOCUMENT_KEYWORDS
-                ) and href.lower().endswith(".pdf"):
-                    # 4. Construct the full URL for the document
-                    doc_url = urljoin(record.source_url, href)
-
-                    logger.info(
-                        f"Found document '{link_text}' at {doc_url} for "
-                        f"EPAR {record.epar_id}"
-                    )
+                # 2. Find all relevant document links on the page
+                documents = _find_document_links(page_future.result(), page_url)
+            except (requests.exceptions.RequestException, etree.ParserError) as e:
+                logger.error(
+                    f"Failed to fetch or parse HTML for EPAR {record.epar_id} "
+                    f"from {page_url}: {e}"
+                )
+                continue  # Skip to the next record
 
-                    # 5. Download the document
-                    storage_uri, file_hash = download_document_and_hash(
-                        url=doc_url, storage=storage
-                    )
+            downloaded_docs_per_record.setdefault(record.epar_id, 0)
 
-                    # 6. Create the EparDocument record
-                    doc = EparDocument(
-                        document_id=uuid.uuid4(),
-                        epar_id=record.epar_id,
-                        document_type=link_text,
-                        language_code="en",
-                        source_url=doc_url,
-                        storage_location=storage_uri,
-                        file_hash=file_hash,
-                        download_timestamp=datetime.datetime.now(
-                            datetime.timezone.utc
+            for link_text, doc_url in documents:
+                logger.info(
+                    f"Found document '{link_text}' at {doc_url} for "
+                    f"EPAR {record.epar_id}"
+                )
+                # 3. Queue the download on the same pool
+                download_futures.append(
+                    (
+                        record,
+                        executor.submit(
+                            _download_document,
+                            record,
+                            link_text,
+                            doc_url,
+                            storage,
+                            document_cache,
                         ),
                     )
-                    document_records.append(doc)
-                    found_docs_for_record = True
+                )
 
+        # 4. Collect the downloaded documents' EparDocument records
+        for record, future in download_futures:
+            try:
+                document_records.append(future.result())
+                downloaded_docs_per_record[record.epar_id] += 1
             except Exception as e:
                 # Catch exceptions on a per-link basis
                 logger.error(
-                    f"Failed to process document link for EPAR {record.epar_id} "
-                    f"from {record.source_url}: {e}",
+                    f"Failed to process document link for EPAR "
+                    f"{record.epar_id} from {record.source_url}: {e}",
                     exc_info=True,
                 )
-                continue  # Continue to the next link
 
-        if not found_docs_for_record:
+    for record in processed_records:
+        if downloaded_docs_per_record.get(record.epar_id) == 0:
             logger.warning(
                 "Could not find any downloadable PDF documents on page: "
                 f"{record.source_url}"
@@ -272,18 +381,33 @@ def _process_documents(
     return loaded_count
 
 
-def run_etl(settings: Settings) -> None:
+def run_etl(
+    settings: Settings,
+    *,
+    spor_client: Optional[SporApiClient] = None,
+) -> None:
     """
     Runs the main ETL pipeline, including document processing, in a memory-efficient
     batch-oriented way.
+
+    Args:
+        settings: The application settings.
+        spor_client: The SPOR API client used to enrich records. Defaults to a
+            client built from `settings.spor_api`.
     """
     logger.info(f"Starting ETL run with strategy: {settings.etl.load_strategy}")
     adapter = get_db_adapter(settings)
-    spor_client = SporApiClient(settings.spor_api)
-    storage = StorageFactory(settings.storage).get_storage()
+    # A client built here is closed when the run ends; an injected one is left
+    # open for its owner.
+    owns_spor_client = spor_client is None
+    client: SporApiClient = spor_client or SporApiClient(settings.spor_api)
     execution_id = None
 
     try:
+        if owns_spor_client:
+            # Connect while the EMA file is downloaded, ahead of the first lookup.
+            client.preconnect()
+        storage = StorageFactory(settings.storage).get_storage()
         adapter.connect(connection_params=None)
 
         # 1. Log pipeline start and get execution ID
@@ -303,27 +427,12 @@ def run_etl(settings: Settings) -> None:
         if settings.etl.load_strategy.upper() == "DELTA":
             high_water_mark = adapter.get_latest_high_water_mark()
 
+        # extract_data already keeps one record per 'product_number', so the
+        # records stream straight into the transform stage.
         raw_records_iterator = extract_data(settings, high_water_mark)
 
-        # Materialize the iterator to a DataFrame for deduplication
-        raw_records_df = pd.DataFrame(raw_records_iterator)
-
-        if not raw_records_df.empty:
-            # Deduplicate records based on the unique identifier 'product_number'
-            # before any costly transformations.
-            initial_count = len(raw_records_df)
-            raw_records_df.drop_duplicates(
-                subset=["product_number"], keep="first", inplace=True
-            )
-            deduped_count = len(raw_records_df)
-            if initial_count > deduped_count:
-                logger.info(
-                    f"Removed {initial_count - deduped_count} duplicate records "
-                    "based on 'product_number'."
-                )
-
         enriched_models_iterator = transform_and_validate(
-            raw_records_df.to_dict("records"), spor_client, execution_id
+            raw_records_iterator, client, execution_id
         )
         batches = _batch_iterator(enriched_models_iterator, settings.etl.batch_size)
 
@@ -407,9 +516,19 @@ def run_etl(settings: Settings) -> None:
             logger.info(
                 f"Processing documents for {len(records_with_urls)} EPAR records with URLs."
             )
-            _process_documents(
-                adapter=adapter, processed_records=records_with_urls, storage=storage
-            )
+            cache_path = settings.etl.document_cache_path
+            with (
+                DocumentCache(cache_path, _storage_target(settings.storage))
+                if cache_path
+                else contextlib.nullcontext()
+            ) as document_cache:
+                _process_documents(
+                    adapter=adapter,
+                    processed_records=records_with_urls,
+                    storage=storage,
+                    max_workers=settings.etl.download_concurrency,
+                    document_cache=document_cache,
+                )
 
         # 7. Load substance links now that epar_index is populated
         logger.info(f"Processing {len(all_substance_links)} total substance links.")
@@ -435,5 +554,7 @@ def run_etl(settings: Settings) -> None:
             adapter.rollback()
         raise
     finally:
+        if owns_spor_client:
+            client.close()
         if adapter and getattr(adapter, "close", None):
             adapter.close()
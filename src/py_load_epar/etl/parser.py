@@ -1,22 +1,40 @@
+import datetime
+import errno
+import functools
 import logging
+import os
 import re
 from pathlib import Path
-from typing import IO, Any, Dict, Iterator, Union
+from typing import IO, Any, Dict, Iterator, Tuple, Union
 
 import openpyxl
 
+try:
+    import python_calamine
+
+    _HAS_CALAMINE = True
+except ImportError:  # Optional: install the 'calamine' extra for faster parsing
+    _HAS_CALAMINE = False
+
 logger = logging.getLogger(__name__)
 
+# Maps the separator characters ' ' through '/' (which include '-' and '.') to
+# underscores in a single str.translate pass.
+_SEPARATOR_TABLE = str.maketrans(
+    dict.fromkeys(map(chr, range(ord(" "), ord("/") + 1)), "_")
+)
 
+@functools.lru_cache(maxsize=256)
 def _snake_case(s: str) -> str:
     """
     Converts a string to a valid snake_case identifier.
     Example: 'Marketing Authorisation Holder' -> 'marketing_authorisation_holder'.
+    Results are cached, as the same few column headers recur in every file.
     """
     if not isinstance(s, str):
         return ""
     # Replace known separators with underscore
-    s = re.sub(r"[ -/]", "_", s)
+    s = s.translate(_SEPARATOR_TABLE)
     # Handle camelCase by inserting underscore before uppercase letters
     s = re.sub(r"(?<=[a-zA-Z0-9])([A-Z])", r"_\1", s)
     # Remove any characters that are not alphanumeric or underscore
@@ -24,6 +42,69 @@ def _snake_case(s: str) -> str:
     return s.lower()
 
 
+def _calamine_value(value: Any) -> Any:
+    """
+    Normalises a calamine cell value to the type openpyxl would return for it,
+    so both engines yield identical records.
+    """
+    if value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if type(value) is datetime.date:
+        return datetime.datetime.combine(value, datetime.time())
+    return value
+
+
+def _iter_calamine_rows(
+    file_source: Union[Path, IO[bytes]],
+) -> Iterator[Tuple[Any, ...]]:
+    """Reads the first worksheet's rows with the Rust-based calamine engine."""
+    if isinstance(file_source, Path):
+        # calamine reports a missing file as a bare OSError; raise the same
+        # FileNotFoundError openpyxl does.
+        if not file_source.is_file():
+            raise FileNotFoundError(
+                errno.ENOENT, os.strerror(errno.ENOENT), str(file_source)
+            )
+        # Let calamine read the file itself rather than through a Python file object
+        workbook = python_calamine.CalamineWorkbook.from_path(str(file_source))
+    else:
+        workbook = python_calamine.CalamineWorkbook.from_filelike(file_source)
+
+    if not workbook.sheet_names:
+        raise ValueError("Excel file contains no worksheets.")
+    sheet = workbook.get_sheet_by_index(0)
+    for row in sheet.iter_rows():
+        yield tuple(_calamine_value(value) for value in row)
+
+
+def _iter_openpyxl_rows(
+    file_source: Union[Path, IO[bytes]],
+) -> Iterator[Tuple[Any, ...]]:
+    """
+    Reads the first worksheet's rows with openpyxl in read-only mode.
+
+    The first worksheet is read rather than the one saved as active, because
+    calamine cannot tell which sheet is active. data_only=True returns the
+    cached result of formula cells instead of the formula text, matching what
+    the calamine engine yields.
+    """
+    # openpyxl.load_workbook can accept either a filename (Path) or a
+    # file-like object directly.
+    workbook = openpyxl.load_workbook(
+        filename=file_source, read_only=True, data_only=True
+    )
+    try:
+        if not workbook.worksheets:
+            raise ValueError("Excel file contains no worksheets.")
+
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        # Read-only workbooks keep the underlying archive open until closed
+        workbook.close()
+
+
 def parse_ema_excel_file(
     file_source: Union[Path, IO[bytes]]
 ) -> Iterator[Dict[str, Any]]:
@@ -31,7 +112,9 @@ def parse_ema_excel_file(
     Parses an EMA Excel file and yields each row as a dictionary.
 
     This function is memory-efficient as it reads the workbook in read-only
-    mode and yields rows one by one using a generator. It also dynamically
+    mode and yields rows one by one using a generator. When the optional
+    python-calamine package is installed, it is used instead of openpyxl for
+    much faster parsing of large workbooks. It also dynamically
     maps columns based on the header row, making it resilient to changes in
     column order. The header names are converted to snake_case to align with
     Pydantic model field names.
@@ -46,16 +129,11 @@ def parse_ema_excel_file(
     """
     logger.info(f"Starting to parse Excel file from source: {type(file_source)}")
     try:
-        # openpyxl.load_workbook can accept either a filename (Path) or a
-        # file-like object directly.
-        workbook = openpyxl.load_workbook(filename=file_source, read_only=True)
-        sheet = workbook.active
-
-        if sheet is None:
-            raise ValueError("Excel file contains no active sheets.")
-
         # Get an iterator for all rows
-        rows_iterator = sheet.iter_rows(values_only=True)
+        if _HAS_CALAMINE:
+            rows_iterator = _iter_calamine_rows(file_source)
+        else:
+            rows_iterator = _iter_openpyxl_rows(file_source)
 
         # --- Get header row ---
         try:
@@ -1,7 +1,9 @@
+import itertools
 import logging
 import re
-from typing import Any, Dict, Iterator, List, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
+import requests
 from pydantic import ValidationError
 
 from py_load_epar.models import (
@@ -14,6 +16,61 @@ from py_load_epar.spor_api.client import SporApiClient
 
 logger = logging.getLogger(__name__)
 
+# Separators between substance names in the 'active_substance_raw' field.
+_SUBSTANCE_SEPARATOR_RE = re.compile(r"[,;]|\s+and\s+")
+
+# Number of records whose SPOR lookups are resolved together before they are
+# transformed.
+SPOR_LOOKUP_WINDOW = 64
+
+
+def _split_substances(active_substance_raw: str) -> List[str]:
+    """Splits a raw active substance field into the individual substance names."""
+    return [
+        name.strip()
+        for name in _SUBSTANCE_SEPARATOR_RE.split(active_substance_raw)
+        if name.strip()
+    ]
+
+
+def _with_prefetched_lookups(
+    raw_records: Iterable[Dict[str, Any]], spor_client: SporApiClient
+) -> Iterator[Tuple[Dict[str, Any], bool]]:
+    """
+    Yields the raw records unchanged, each with whether SPOR lookups are
+    available for it, resolving the lookups in windows of SPOR_LOOKUP_WINDOW
+    records first.
+
+    The organisation and substance names of a window are searched concurrently,
+    which fills the client's caches, so the per-record searches in
+    `transform_and_validate` become cache hits. If the SPOR API cannot be
+    reached for a window, its records are loaded without enrichment rather than
+    being looked up one by one against the failing API.
+    """
+    records = iter(raw_records)
+    while window := list(itertools.islice(records, SPOR_LOOKUP_WINDOW)):
+        organisation_names = []
+        substance_names = []
+        for record in window:
+            organisation = record.get("marketing_authorization_holder_raw")
+            if isinstance(organisation, str) and organisation:
+                organisation_names.append(organisation)
+            substances = record.get("active_substance_raw")
+            if isinstance(substances, str):
+                substance_names.extend(_split_substances(substances))
+        try:
+            spor_client.search_organisations(organisation_names)
+            spor_client.search_substances(substance_names)
+            lookups_available = True
+        except requests.exceptions.RequestException as e:
+            logger.warning(
+                f"SPOR API unavailable; loading {len(window)} records without "
+                f"enrichment: {e}"
+            )
+            lookups_available = False
+        for record in window:
+            yield record, lookups_available
+
 
 def transform_and_validate(  # noqa: C901
     raw_records: Iterator[Dict[str, Any]],
@@ -29,6 +86,7 @@ def transform_and_validate(  # noqa: C901
     - Generates a stable `epar_id`.
     - Enriches organisation data using SPOR OMS.
     - Enriches substance data using SPOR SMS and creates link table records.
+    - Resolves the SPOR lookups of each window of records concurrently first.
     - Captures the discovered master data (Organisations, Substances) to be loaded.
     - Records that fail validation are logged and skipped (quarantined).
 
@@ -48,7 +106,9 @@ def transform_and_validate(  # noqa: C901
     validated_count = 0
     failed_count = 0
 
-    for i, raw_record in enumerate(raw_records):
+    for i, (raw_record, lookups_available) in enumerate(
+        _with_prefetched_lookups(raw_records, spor_client)
+    ):
         try:
             # Use 'product_number' from source as the stable unique ID.
             product_number = raw_record.get("product_number")
@@ -74,7 +134,10 @@ def transform_and_validate(  # noqa: C901
                 validated_model.is_active = False
 
             # 3. Enrich Organisation (MAH) and capture master data
-            if validated_model.marketing_authorization_holder_raw:
+            if (
+                lookups_available
+                and validated_model.marketing_authorization_holder_raw
+            ):
                 try:
                     org_api = spor_client.search_organisation(
                         validated_model.marketing_authorization_holder_raw
@@ -97,14 +160,10 @@ def transform_and_validate(  # noqa: C901
                     )
 
             # 4. Enrich Substances, create link records, and capture master data
-            if hasattr(validated_model, "active_substance_raw") and validated_model.active_substance_raw:
-                substance_names = re.split(
-                    r"[,;]|\s+and\s+", validated_model.active_substance_raw
-                )
-                for sub_name_raw in substance_names:
-                    sub_name = sub_name_raw.strip()
-                    if not sub_name:
-                        continue
+            if lookups_available and validated_model.active_substance_raw:
+                for sub_name in _split_substances(
+                    validated_model.active_substance_raw
+                ):
                     try:
                         sub_api = spor_client.search_substance(sub_name)
                         if sub_api:
@@ -1,7 +1,28 @@
+import base64
+import binascii
+import json
 import logging
-from typing import Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import TracebackType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
 
 import requests
+from cachetools import LRUCache
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from py_load_epar.config import SporApiSettings
@@ -9,6 +30,136 @@ from py_load_epar.spor_api.models import SporOmsOrganisation, SporSmsSubstance
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Batched lookups are I/O bound, so they run on a pool of threads.
+MAX_LOOKUP_WORKERS = 8
+
+# Tokens are renewed this many seconds before they expire, so a request is never
+# sent with a token that lapses in flight.
+TOKEN_REFRESH_MARGIN = 60
+
+# Assumed lifetime of a token whose expiry cannot be read from it.
+DEFAULT_TOKEN_LIFETIME = 3600
+
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of the SPOR lookup caches, in the style of `functools`."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _NoMatch(NamedTuple):
+    """A cached lookup without a result, which is kept until `expires_at`."""
+
+    expires_at: float
+
+
+class _LookupCache(Generic[T]):
+    """
+    The cache of one kind of SPOR lookup.
+
+    The entries of every kind of lookup are kept in one LRU cache shared by the
+    client, so its `maxsize` bounds them all together. Matches are kept until
+    they are evicted. Misses expire after `negative_ttl` seconds instead, so a
+    name that is not in SPOR today is looked up again later rather than being
+    pinned forever. Failed lookups expire after the shorter `failure_ttl`, so an
+    outage does not hide names for as long as a genuine miss.
+    """
+
+    def __init__(
+        self,
+        entries: LRUCache[Tuple[str, str], Any],
+        kind: str,
+        negative_ttl: float,
+        failure_ttl: float,
+    ):
+        self._entries = entries
+        self._kind = kind
+        self._negative_ttl = negative_ttl
+        self._failure_ttl = failure_ttl
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # Cache.get reads through __getitem__, which marks the entry as used.
+        value = self._entries.get((self._kind, key), _MISSING)
+        if isinstance(value, _NoMatch):
+            if value.expires_at > time.monotonic():
+                return None
+            del self._entries[(self._kind, key)]
+            value = _MISSING
+        return default if value is _MISSING else value
+
+    def __getitem__(self, key: str) -> Optional[T]:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return cast(Optional[T], value)
+
+    def __setitem__(self, key: str, value: Optional[T]) -> None:
+        if value is None:
+            self._entries[(self._kind, key)] = _NoMatch(
+                time.monotonic() + self._negative_ttl
+            )
+        else:
+            self._entries[(self._kind, key)] = value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.get(key, _MISSING) is not _MISSING
+
+    def set_failed(self, key: str) -> None:
+        """Remembers that looking up a key failed, for `failure_ttl` seconds."""
+        self._entries[(self._kind, key)] = _NoMatch(
+            time.monotonic() + self._failure_ttl
+        )
+
+
+def _cache_key(name: str) -> str:
+    """
+    Returns the lookup cache key for a name, ignoring case and differences in
+    whitespace, so spellings such as 'Test Pharma' and 'test  pharma ' share one
+    API call.
+    """
+    return " ".join(name.casefold().split())
+
+
+def _token_expiry(token: str) -> float:
+    """
+    Returns the expiry time of an access token as a Unix timestamp.
+
+    SPOR issues JWTs, so the `exp` claim is read from the token's payload. The
+    signature is not verified; the token is only ever sent back to the server
+    that issued it. Tokens without a readable expiry are assumed to last
+    DEFAULT_TOKEN_LIFETIME seconds.
+    """
+    try:
+        payload = token.split(".")[1]
+        padded = payload + "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(padded))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError, binascii.Error):
+        return time.time() + DEFAULT_TOKEN_LIFETIME
+
+
+def _build_session() -> requests.Session:
+    """
+    Builds the HTTP session used for every SPOR API call.
+
+    The authentication request and all searches go through one pooled adapter,
+    so they reuse kept-alive connections to the API host instead of opening a
+    new TCP/TLS connection per lookup. The adapter does not retry; failed
+    requests are retried only by the tenacity decorators on the client.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 
 class SporApiClient:
     """
@@ -19,10 +170,31 @@ class SporApiClient:
 
     def __init__(self, settings: SporApiSettings):
         self.settings = settings
-        self._session = requests.Session()
+        self._session = _build_session()
         self._auth_token: Optional[str] = None
-        self._org_cache: Dict[str, Optional[SporOmsOrganisation]] = {}
-        self._substance_cache: Dict[str, Optional[SporSmsSubstance]] = {}
+        self._token_expires_at = 0.0
+        # Serialises token refreshes between the threads of batched searches.
+        self._auth_lock = threading.Lock()
+        # Lookup results are kept in one bounded cache; the lock guards it and the
+        # statistics against the concurrent lookups of batched searches.
+        self._cache_lock = threading.Lock()
+        self._cache_entries: LRUCache[Tuple[str, str], Any] = LRUCache(
+            maxsize=settings.cache_maxsize
+        )
+        self._org_cache: _LookupCache[SporOmsOrganisation] = _LookupCache(
+            self._cache_entries,
+            "organisation",
+            settings.negative_cache_ttl,
+            settings.failure_cache_ttl,
+        )
+        self._substance_cache: _LookupCache[SporSmsSubstance] = _LookupCache(
+            self._cache_entries,
+            "substance",
+            settings.negative_cache_ttl,
+            settings.failure_cache_ttl,
+        )
+        self._cache_hits = 0
+        self._cache_misses = 0
 
     @retry(
         wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -32,31 +204,45 @@ class SporApiClient:
     def _authenticate(self) -> None:
         """
         Authenticates with the SPOR API and stores the Bearer token.
+        The stored token is reused until it is about to expire. Refreshes are
+        serialised, so concurrent lookups near expiry authenticate only once.
         """
-        if self._auth_token:
+        if self._has_valid_token():
             return
 
-        auth_url = f"{self.settings.base_url}/api/Account"
-        logger.info(f"Authenticating with SPOR API at {auth_url}.")
-        try:
-            response = self._session.post(
-                auth_url,
-                json={
-                    "tenancyName": self.settings.tenancy_name,
-                    "username": self.settings.username,
-                    "password": self.settings.password.get_secret_value(),
-                },
-                timeout=30,
-            )
-            response.raise_for_status()
-            self._auth_token = response.json()["result"]["accessToken"]
-            self._session.headers.update(
-                {"Authorization": f"Bearer {self._auth_token}"}
-            )
-            logger.info("Successfully authenticated with SPOR API.")
-        except requests.exceptions.RequestException as e:
-            logger.error(f"SPOR API authentication failed: {e}")
-            raise
+        with self._auth_lock:
+            # Another thread may have refreshed the token while this one waited.
+            if self._has_valid_token():
+                return
+
+            auth_url = f"{self.settings.base_url}/api/Account"
+            logger.info(f"Authenticating with SPOR API at {auth_url}.")
+            try:
+                response = self._session.post(
+                    auth_url,
+                    json={
+                        "tenancyName": self.settings.tenancy_name,
+                        "username": self.settings.username,
+                        "password": self.settings.password.get_secret_value(),
+                    },
+                    timeout=30,
+                )
+                response.raise_for_status()
+                self._auth_token = response.json()["result"]["accessToken"]
+                self._token_expires_at = _token_expiry(self._auth_token)
+                self._session.headers.update(
+                    {"Authorization": f"Bearer {self._auth_token}"}
+                )
+                logger.info("Successfully authenticated with SPOR API.")
+            except requests.exceptions.RequestException as e:
+                logger.error(f"SPOR API authentication failed: {e}")
+                raise
+
+    def _has_valid_token(self) -> bool:
+        """Whether the stored token can still be used for a request."""
+        return bool(self._auth_token) and time.time() < (
+            self._token_expires_at - TOKEN_REFRESH_MARGIN
+        )
 
     @retry(
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -85,10 +271,13 @@ class SporApiClient:
         """
         Searches for an organisation by name in the SPOR OMS.
         Returns the first result if a high-confidence match is found.
-        Caches results to avoid redundant API calls.
+        Caches results to avoid redundant API calls; misses are cached for
+        `negative_cache_ttl` seconds and failed lookups for `failure_cache_ttl`.
         """
-        if name in self._org_cache:
-            return self._org_cache[name]
+        key = _cache_key(name)
+        cached = self._cache_lookup(self._org_cache, key)
+        if cached is not _MISSING:
+            return cast(Optional[SporOmsOrganisation], cached)
 
         self._authenticate()
         search_url = f"{self.settings.base_url}/api/v1/spor/oms/organisations"
@@ -102,30 +291,36 @@ class SporApiClient:
             if len(data.get("items", [])) == 1:
                 org_data = data["items"][0]
                 organisation = SporOmsOrganisation.model_validate(org_data)
-                self._org_cache[name] = organisation
+                self._cache_store(self._org_cache, key, organisation)
                 return organisation
             else:
                 logger.debug(
                     f"Found {len(data.get('items', []))} results for '{name}'. "
                     "Not a high-confidence match."
                 )
-                self._org_cache[name] = None
+                self._cache_store(self._org_cache, key, None)
                 return None
 
         except requests.exceptions.RequestException as e:
             logger.error(
                 f"Failed to search for organisation '{name}' after " f"retries: {e}"
             )
+            # Remember the failure for a short while, so the records naming
+            # this organisation next don't all go through the retries again.
+            self._cache_store_failure(self._org_cache, key)
             return None
 
     def search_substance(self, name: str) -> Optional[SporSmsSubstance]:
         """
         Searches for a substance by name in the SPOR SMS.
         Returns the first result if a high-confidence match is found.
-        Caches results to avoid redundant API calls.
+        Caches results to avoid redundant API calls; misses are cached for
+        `negative_cache_ttl` seconds and failed lookups for `failure_cache_ttl`.
         """
-        if name in self._substance_cache:
-            return self._substance_cache[name]
+        key = _cache_key(name)
+        cached = self._cache_lookup(self._substance_cache, key)
+        if cached is not _MISSING:
+            return cast(Optional[SporSmsSubstance], cached)
 
         self._authenticate()
         search_url = f"{self.settings.base_url}/api/v1/spor/sms/substances"
@@ -138,16 +333,184 @@ class SporApiClient:
             if len(data.get("items", [])) == 1:
                 substance_data = data["items"][0]
                 substance = SporSmsSubstance.model_validate(substance_data)
-                self._substance_cache[name] = substance
+                self._cache_store(self._substance_cache, key, substance)
                 return substance
             else:
                 logger.debug(
                     f"Found {len(data.get('items', []))} results for '{name}'. "
                     "Not a high-confidence match."
                 )
-                self._substance_cache[name] = None
+                self._cache_store(self._substance_cache, key, None)
                 return None
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to search for substance '{name}' after retries: {e}")
+            # As for organisations, failed lookups are not retried for a while.
+            self._cache_store_failure(self._substance_cache, key)
             return None
+
+    def search_organisations(
+        self, names: Iterable[str], max_workers: int = MAX_LOOKUP_WORKERS
+    ) -> Dict[str, Optional[SporOmsOrganisation]]:
+        """
+        Searches for several organisations at once.
+
+        Names that are not cached yet are looked up concurrently, so a batch
+        costs about one round trip instead of one per name. Results are cached
+        exactly as by `search_organisation`.
+
+        Args:
+            names: The organisation names to look up; duplicates are ignored.
+            max_workers: The maximum number of concurrent lookups.
+
+        Returns:
+            A mapping from each distinct name to its search result.
+        """
+        return self._search_many(
+            self.search_organisation, self._org_cache, names, max_workers
+        )
+
+    def search_substances(
+        self, names: Iterable[str], max_workers: int = MAX_LOOKUP_WORKERS
+    ) -> Dict[str, Optional[SporSmsSubstance]]:
+        """
+        Searches for several substances at once, like `search_organisations`.
+
+        Args:
+            names: The substance names to look up; duplicates are ignored.
+            max_workers: The maximum number of concurrent lookups.
+
+        Returns:
+            A mapping from each distinct name to its search result.
+        """
+        return self._search_many(
+            self.search_substance, self._substance_cache, names, max_workers
+        )
+
+    def _search_many(
+        self,
+        search: Callable[[str], Optional[T]],
+        cache: _LookupCache[T],
+        names: Iterable[str],
+        max_workers: int,
+    ) -> Dict[str, Optional[T]]:
+        """Runs `search` for every distinct name, fanning out the cache misses."""
+        unique_names = list(dict.fromkeys(names))
+        results: Dict[str, Optional[T]] = {}
+        # One lookup per cache key, so spellings of the same name share it.
+        pending: Dict[str, str] = {}
+        for name in unique_names:
+            key = _cache_key(name)
+            if key in results or key in pending:
+                continue
+            cached = self._cache_lookup(cache, key, count_miss=False)
+            if cached is _MISSING:
+                pending[key] = name
+            else:
+                results[key] = cached
+        if len(pending) > 1:
+            # Authenticate up front so the workers don't race for the token.
+            self._authenticate()
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(pending))
+            ) as executor:
+                results.update(zip(pending, executor.map(search, pending.values())))
+        else:
+            results.update((key, search(name)) for key, name in pending.items())
+        return {name: results[_cache_key(name)] for name in unique_names}
+
+    def _cache_lookup(
+        self, cache: _LookupCache[Any], key: str, count_miss: bool = True
+    ) -> Any:
+        """
+        Returns the cached result for a key, or _MISSING, and updates the hit and
+        miss counters. Batched searches count their misses in the lookup that
+        follows instead.
+        """
+        with self._cache_lock:
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                self._cache_hits += 1
+            elif count_miss:
+                self._cache_misses += 1
+        return value
+
+    def _cache_store(self, cache: _LookupCache[Any], key: str, value: Any) -> None:
+        """Caches a lookup result, evicting the least recently used if full."""
+        with self._cache_lock:
+            cache[key] = value
+
+    def _cache_store_failure(self, cache: _LookupCache[Any], key: str) -> None:
+        """Caches a lookup that failed after its retries."""
+        with self._cache_lock:
+            cache.set_failed(key)
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Returns the hit and miss counts of the organisation and substance
+        lookups, the capacity of the cache they share and the entries it holds.
+        """
+        with self._cache_lock:
+            return CacheInfo(
+                hits=self._cache_hits,
+                misses=self._cache_misses,
+                maxsize=self.settings.cache_maxsize,
+                currsize=len(self._cache_entries),
+            )
+
+    def cache_clear(self) -> None:
+        """Empties the lookup caches and resets their statistics."""
+        with self._cache_lock:
+            self._cache_entries.clear()
+            self._cache_hits = 0
+            self._cache_misses = 0
+
+    def reset(self) -> None:
+        """
+        Returns the client to the state it was built in: the lookup caches and
+        their statistics are emptied and the authentication token is dropped.
+        Pooled connections are kept.
+        """
+        self.cache_clear()
+        with self._auth_lock:
+            self._auth_token = None
+            self._token_expires_at = 0.0
+            self._session.headers.pop("Authorization", None)
+
+    def preconnect(self) -> threading.Thread:
+        """
+        Opens a pooled connection to the SPOR API on a background thread, so the
+        TCP and TLS handshakes overlap with other work instead of delaying the
+        first lookup.
+
+        Returns:
+            The started daemon thread.
+        """
+        thread = threading.Thread(
+            target=self._preconnect, name="spor-preconnect", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _preconnect(self) -> None:
+        """Sends a HEAD request to the API root, leaving its connection pooled."""
+        try:
+            self._session.head(f"{self.settings.base_url}/", timeout=2).close()
+        except requests.exceptions.RequestException as e:
+            # The first lookup will simply connect as usual.
+            logger.debug(f"Preconnecting to the SPOR API failed: {e}")
+
+    def close(self) -> None:
+        """Closes the pooled connections of the underlying HTTP session."""
+        self._session.close()
+
+    def __enter__(self) -> "SporApiClient":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SporOmsOrganisation(BaseModel):
@@ -6,6 +6,8 @@ class SporOmsOrganisation(BaseModel):
     A simplified Pydantic model for a single organisation from the SPOR OMS API.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     org_id: str = Field(..., alias="orgId")
     name: str
 
@@ -23,6 +25,8 @@ class SporSmsSubstance(BaseModel):
     A simplified Pydantic model for a single substance from the SPOR SMS API.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     sms_id: str = Field(..., alias="smsId")
     name: str
 
@@ -1,5 +1,6 @@
 import logging
-from typing import cast
+import threading
+from typing import Dict, cast
 
 from py_load_epar.config import StorageSettings
 from py_load_epar.storage.interfaces import IStorage
@@ -12,14 +13,23 @@ logger = logging.getLogger(__name__)
 class StorageFactory:
     """
     Factory for creating storage adapter instances based on configuration.
+
+    Adapters are shared across the process: every factory given identical
+    storage settings returns the same instance, so repeated ETL runs don't
+    rebuild them. Settings that differ in any field get their own adapter.
     """
 
+    # Shared adapters, keyed by the JSON form of their storage settings
+    _instances: Dict[str, IStorage] = {}
+    _lock = threading.Lock()
+
     def __init__(self, settings: StorageSettings):
         self.settings = settings
 
     def get_storage(self) -> IStorage:
         """
-        Instantiates and returns the appropriate storage adapter.
+        Returns the storage adapter for the configured backend, creating it on
+        first use.
 
         Returns:
             An instance of a class that implements the IStorage interface.
@@ -27,6 +37,21 @@ class StorageFactory:
         Raises:
             ValueError: If the configured backend is not supported.
         """
+        key = self.settings.model_dump_json()
+        with self._lock:
+            storage = self._instances.get(key)
+            if storage is None:
+                storage = self._instances[key] = self._create_storage()
+        return storage
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forgets the shared adapters, so the next request creates new ones."""
+        with cls._lock:
+            cls._instances.clear()
+
+    def _create_storage(self) -> IStorage:
+        """Instantiates the storage adapter for the configured backend."""
         backend = self.settings.backend.lower()
         logger.info(f"Creating storage adapter for backend: '{backend}'")
 
@@ -1,4 +1,5 @@
 import logging
+import shutil
 from pathlib import Path
 from typing import IO
 
@@ -6,6 +7,10 @@ from py_load_epar.storage.interfaces import IStorage
 
 logger = logging.getLogger(__name__)
 
+# Documents are copied to disk in 1 MiB blocks, so memory use stays flat
+# regardless of the document's size.
+COPY_BUFFER_SIZE = 1024 * 1024
+
 
 class LocalStorage(IStorage):
     """
@@ -54,7 +59,7 @@ class LocalStorage(IStorage):
             with open(destination_path, "wb") as f:
                 # Reset stream position just in case
                 data_stream.seek(0)
-                f.write(data_stream.read())
+                shutil.copyfileobj(data_stream, f, COPY_BUFFER_SIZE)
 
             file_uri = destination_path.as_uri()
             logger.info(f"Successfully saved file to {file_uri}")
@@ -1,25 +1,90 @@
+import io
 import logging
-from typing import IO, Optional
+import threading
+from typing import IO, Any, Dict, Optional, cast
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 
 from py_load_epar.storage.interfaces import IStorage
 
 logger = logging.getLogger(__name__)
 
+# EPAR documents can run to tens of MiB. Anything above 8 MiB is uploaded in
+# 8 MiB parts, several at a time, so the parts' network transfers overlap.
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_CHUNK_SIZE,
+    multipart_chunksize=MULTIPART_CHUNK_SIZE,
+    max_concurrency=8,
+    use_threads=True,
+)
+
+# Downloaded documents reach `save` as non-seekable streams, whose parts
+# s3transfer buffers in memory before sending them. Such uploads hold and send
+# at most this many parts at a time, so the 16 documents a run downloads at once
+# (etl.download_concurrency) buffer no more than 16 x 2 x 8 MiB = 256 MiB.
+STREAMING_UPLOAD_PARTS = 2
+STREAMING_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_CHUNK_SIZE,
+    multipart_chunksize=MULTIPART_CHUNK_SIZE,
+    max_concurrency=STREAMING_UPLOAD_PARTS,
+    use_threads=True,
+)
+STREAMING_TRANSFER_CONFIG.max_in_memory_upload_chunks = STREAMING_UPLOAD_PARTS
+
+# S3 clients shared by every S3Storage, keyed by region
+_CLIENTS: Dict[Optional[str], Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _shared_s3_client(region_name: Optional[str]) -> Any:
+    """
+    Returns the S3 client shared by every S3Storage in a region.
+
+    Building a client loads botocore's service models, which is slow, while a
+    built client is thread-safe. Clients are therefore created once per region
+    and reused. The lookup and creation happen under one lock, because boto3
+    sessions are not thread-safe and concurrent callers must not each build a
+    client.
+    """
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(region_name)
+        if client is None:
+            client = _CLIENTS[region_name] = boto3.client("s3", region_name=region_name)
+        return client
+
+
+def reset_shared_clients() -> None:
+    """Forgets the shared S3 clients, so the next S3Storage creates a new one."""
+    with _CLIENTS_LOCK:
+        _CLIENTS.clear()
+
 
 class S3Storage(IStorage):
     """
     An adapter for storing files in an AWS S3 bucket.
     """
 
-    def __init__(self, bucket_name: str, region_name: Optional[str] = None):
+    def __init__(
+        self,
+        bucket_name: str,
+        region_name: Optional[str] = None,
+        s3_client: Optional[Any] = None,
+    ):
+        """
+        Args:
+            bucket_name: The bucket to store documents in.
+            region_name: The AWS region of the bucket.
+            s3_client: The boto3 S3 client to use. Defaults to the client shared
+                by all S3Storage instances in `region_name`.
+        """
         if not bucket_name:
             raise ValueError("S3 bucket name must be provided.")
 
         self.bucket_name = bucket_name
-        self.s3_client = boto3.client("s3", region_name=region_name)
+        self.s3_client = s3_client or _shared_s3_client(region_name)
         logger.info(
             f"Initialized S3Storage for bucket '{self.bucket_name}' in region "
             f"'{region_name or 'default'}'."
@@ -45,7 +110,24 @@ class S3Storage(IStorage):
         try:
             # Reset stream position to the beginning
             data_stream.seek(0)
-            self.s3_client.upload_fileobj(data_stream, self.bucket_name, object_name)
+            if data_stream.seekable():
+                self.s3_client.upload_fileobj(
+                    data_stream, self.bucket_name, object_name, Config=TRANSFER_CONFIG
+                )
+            else:
+                # s3transfer takes a short read for the end of the stream, so a
+                # forward-only stream is read through a buffer, which fills each
+                # read. Detaching the buffer afterwards leaves the stream open.
+                buffered = io.BufferedReader(cast(io.RawIOBase, data_stream))
+                try:
+                    self.s3_client.upload_fileobj(
+                        buffered,
+                        self.bucket_name,
+                        object_name,
+                        Config=STREAMING_TRANSFER_CONFIG,
+                    )
+                finally:
+                    buffered.detach()
 
             s3_uri = f"s3://{self.bucket_name}/{object_name}"
             logger.info(f"Successfully uploaded to {s3_uri}")
@@ -1,14 +1,129 @@
 import datetime
+import functools
 from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+)
 from urllib.parse import urlparse
 
 import openpyxl
-import pandas as pd
 import pytest
-from testcontainers.postgres import PostgresContainer
+from psycopg2.pool import SimpleConnectionPool
 
 from py_load_epar.config import DatabaseSettings, Settings
 from py_load_epar.db.postgres import PostgresAdapter
+from py_load_epar.etl.parser import _snake_case
+from py_load_epar.storage.factory import StorageFactory
+from py_load_epar.storage.s3 import reset_shared_clients
+
+if TYPE_CHECKING:
+    from testcontainers.postgres import PostgresContainer
+
+SCHEMA_SQL_PATH = Path(__file__).parent.parent / "src/py_load_epar/db/schema.sql"
+EMA_SHEET_NAME = "Medicines for human use"
+
+
+@functools.lru_cache(maxsize=1)
+def _schema_sql() -> str:
+    """Reads the DDL script once and reuses it for every test database."""
+    return SCHEMA_SQL_PATH.read_text()
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """
+    Marks every test that (directly or transitively) needs the PostgreSQL
+    container as an integration test, so `-m "not integration"` never starts it.
+    All remaining tests are marked as unit tests, so `-m unit` selects exactly
+    the tests that are safe to run without Docker.
+    """
+    for item in items:
+        if "postgres_container" in getattr(item, "fixturenames", ()):
+            item.add_marker(pytest.mark.integration)
+        if item.get_closest_marker("integration") is None:
+            item.add_marker(pytest.mark.unit)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_storage_adapters() -> Iterator[None]:
+    """
+    Stops storage adapters shared by StorageFactory, and the S3 clients shared by
+    S3Storage, leaking between tests.
+    """
+    yield
+    StorageFactory.reset()
+    reset_shared_clients()
+
+
+def write_xlsx_streaming(
+    path: Path, sheet_name: str, header: Sequence[Any], rows: Iterable[Sequence[Any]]
+) -> Path:
+    """
+    Writes a single-sheet workbook using openpyxl's write-only mode, which
+    streams rows straight to the file instead of building the workbook in memory.
+    An empty header produces an empty sheet.
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    if header:
+        sheet.append(list(header))
+    for row in rows:
+        sheet.append(list(row))
+    workbook.save(path)
+    return path
+
+
+def _write_ema_xlsx(file_path: Path, data: Dict[str, List[Any]]) -> Path:
+    """Writes column-oriented test data to an EMA-style workbook."""
+    return write_xlsx_streaming(
+        file_path, EMA_SHEET_NAME, list(data), zip(*data.values())
+    )
+
+
+@pytest.fixture(scope="session")
+def write_ema_xlsx() -> Callable[[Path, Dict[str, List[Any]]], Path]:
+    """Provides the workbook writer used by the tests' data fixtures."""
+    return _write_ema_xlsx
+
+
+def _ema_records(data: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Builds the records `parse_ema_excel_file` yields for a workbook written from
+    the same column-oriented data, without writing or parsing the workbook.
+    """
+    headers = [_snake_case(column) for column in data]
+    return [dict(zip(headers, row)) for row in zip(*data.values())]
+
+
+@pytest.fixture(scope="session")
+def ema_records() -> Callable[[Dict[str, List[Any]]], List[Dict[str, Any]]]:
+    """Provides the builder for parser-shaped records."""
+    return _ema_records
+
+
+@pytest.fixture
+def patch_ema_source(mocker) -> Callable[[List[Dict[str, Any]]], None]:
+    """
+    Returns a function that makes `extract_data` read the given parsed records,
+    skipping the download and the Excel parser. Every ETL run gets a fresh
+    iterator over the records. Use it for tests of the ETL flow; the workbook
+    fixtures above cover parsing.
+    """
+
+    def _patch(records: List[Dict[str, Any]]) -> None:
+        mocker.patch("py_load_epar.etl.extract.download_file_to_memory")
+        mocker.patch(
+            "py_load_epar.etl.extract.parse_ema_excel_file",
+            side_effect=lambda file_source: iter(records),
+        )
+
+    return _patch
 
 
 @pytest.fixture(scope="session")
@@ -21,11 +136,6 @@ def create_sample_excel_file():
     test_data_dir.mkdir(exist_ok=True)
     file_path = test_data_dir / "sample_ema_data.xlsx"
 
-    # Create a new workbook and select the active sheet
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Worksheet"
-
     # Define the headers
     headers = [
         "Category",
@@ -53,7 +163,6 @@ def create_sample_excel_file():
         "Revision date",
         "URL",
     ]
-    ws.append(headers)
 
     # Define the data rows
     data = [
@@ -110,10 +219,7 @@ def create_sample_excel_file():
             "http://example.com/doc2.pdf",
         ],
     ]
-    for row in data:
-        ws.append(row)
-
-    wb.save(file_path)
+    write_xlsx_streaming(file_path, "Worksheet", headers, data)
     # The fixture yields control to the test session
     yield
     # Teardown: remove the file after the session
@@ -125,59 +231,163 @@ def create_sample_excel_file():
     #     pass
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def postgres_container(request):
-    """Fixture to start and stop a PostgreSQL test container."""
+    """
+    Fixture to start a single PostgreSQL test container for the whole session.
+    Tests are isolated from each other by truncating the schema tables in
+    `postgres_adapter`, so the container and schema only need to be set up once.
+
+    Under pytest-xdist every worker is its own session, so each worker gets a
+    private container and parallel tests never touch the same database.
+
+    testcontainers is imported here rather than at module level so that unit-only
+    runs never pay for importing the Docker client.
+    """
+    from testcontainers.postgres import PostgresContainer
+
     postgres = PostgresContainer("postgres:16-alpine")
     postgres.start()
     request.addfinalizer(postgres.stop)
     return postgres
 
 
+def _connection_kwargs(postgres_container: "PostgresContainer") -> dict:
+    """Splits the container's connection URL into psycopg2 keyword arguments."""
+    parsed_url = urlparse(postgres_container.get_connection_url())
+    return {
+        "host": parsed_url.hostname,
+        "port": parsed_url.port,
+        "user": parsed_url.username,
+        "password": parsed_url.password,
+        "dbname": parsed_url.path.lstrip("/"),
+    }
+
+
+@pytest.fixture(scope="session")
+def base_settings() -> Settings:
+    """
+    Builds the default Settings once per session. Tests must not mutate it; use
+    the `settings` fixture for a private copy instead.
+    """
+    return Settings()
+
+
+@pytest.fixture
+def settings(base_settings: Settings) -> Settings:
+    """Provides a deep copy of the default Settings that a test may modify."""
+    return base_settings.model_copy(deep=True)
+
+
 @pytest.fixture(scope="function")
-def db_settings(postgres_container: PostgresContainer) -> Settings:
-    """Fixture to create a DatabaseSettings object from the test container."""
-    connection_url = postgres_container.get_connection_url()
-    parsed_url = urlparse(connection_url)
-    return Settings(
-        db=DatabaseSettings(
-            host=parsed_url.hostname,
-            port=parsed_url.port,
-            user=parsed_url.username,
-            password=parsed_url.password,
-            dbname=parsed_url.path.lstrip("/"),
-        )
+def db_settings(
+    base_settings: Settings, postgres_container: "PostgresContainer"
+) -> Settings:
+    """Fixture to create a Settings object pointing at the test container."""
+    return base_settings.model_copy(
+        update={"db": DatabaseSettings(**_connection_kwargs(postgres_container))},
+        deep=True,
+    )
+
+
+def _with_load_strategy(settings: Settings, load_strategy: str) -> Settings:
+    """Returns a copy of the settings that uses the given ETL load strategy."""
+    return settings.model_copy(
+        update={"etl": settings.etl.model_copy(update={"load_strategy": load_strategy})}
     )
 
 
+@pytest.fixture
+def settings_full(db_settings: Settings) -> Settings:
+    """Provides container settings for a FULL load, leaving `db_settings` as is."""
+    return _with_load_strategy(db_settings, "FULL")
+
+
+@pytest.fixture
+def settings_delta(db_settings: Settings) -> Settings:
+    """Provides container settings for a DELTA load, leaving `db_settings` as is."""
+    return _with_load_strategy(db_settings, "DELTA")
+
+
+@pytest.fixture(scope="session")
+def pg_pool(postgres_container: "PostgresContainer") -> SimpleConnectionPool:
+    """
+    A connection pool shared by every test running against the same container,
+    so each test reuses an open connection instead of paying for connect()/close().
+    """
+    pool = SimpleConnectionPool(1, 4, **_connection_kwargs(postgres_container))
+    yield pool
+    pool.closeall()
+
+
+@pytest.fixture(scope="session")
+def schema_tables(pg_pool: SimpleConnectionPool) -> tuple[str, ...]:
+    """
+    Creates the schema once per container and returns the names of its tables,
+    which tests truncate between runs instead of rebuilding the schema.
+    """
+    conn = pg_pool.getconn()
+    with conn.cursor() as cursor:
+        cursor.execute(_schema_sql())
+        cursor.execute(
+            "SELECT tablename FROM pg_tables WHERE schemaname = 'public' "
+            "ORDER BY tablename"
+        )
+        tables = tuple(row[0] for row in cursor.fetchall())
+    conn.commit()
+    pg_pool.putconn(conn)
+    return tables
+
+
 @pytest.fixture(scope="function")  # Use function scope to get a clean db for each test
-def postgres_adapter(db_settings: Settings) -> PostgresAdapter:
+def postgres_adapter(
+    db_settings: Settings,
+    pg_pool: SimpleConnectionPool,
+    schema_tables: tuple[str, ...],
+) -> PostgresAdapter:
     """
     Fixture to create a PostgresAdapter instance connected to a clean test container.
-    It creates the schema and yields the adapter.
+    It borrows a pooled connection to the already-created schema and yields the
+    adapter.
     """
+    conn = pg_pool.getconn()
+    conn.autocommit = False
     adapter = PostgresAdapter(db_settings.db)
-    adapter.connect()
-
-    # Create schema for each test function
-    with open("src/py_load_epar/db/schema.sql") as f:
-        with adapter.conn.cursor() as cursor:
-            cursor.execute(f.read())
-    adapter.conn.commit()
+    adapter.conn = conn
 
     yield adapter
 
-    # Teardown: drop all tables to ensure a clean state for the next test
-    with adapter.conn.cursor() as cursor:
-        cursor.execute("DROP SCHEMA public CASCADE; CREATE SCHEMA public;")
-    adapter.conn.commit()
-    adapter.close()
+    # Some tests close the adapter or reconnect it; only the borrowed connection
+    # goes back to the pool.
+    if adapter.conn is not conn:
+        adapter.close()
+    if conn.closed:
+        pg_pool.putconn(conn, close=True)
+        conn = pg_pool.getconn()
+    conn.rollback()
+
+    # Teardown: empty every schema table to ensure a clean state for the next test
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"TRUNCATE {', '.join(schema_tables)} RESTART IDENTITY CASCADE;"
+        )
+    conn.commit()
+    pg_pool.putconn(conn, close=False)
 
 
-@pytest.fixture
-def single_record_excel_file(tmp_path: Path) -> Path:
+@pytest.fixture(scope="session")
+def xlsx_bytes():
+    """
+    Returns a reader that loads a fixture workbook's bytes from disk once per path,
+    so tests can hand the ETL a fresh in-memory stream without reopening the file.
+    """
+    return functools.lru_cache(maxsize=None)(Path.read_bytes)
+
+
+@pytest.fixture(scope="session")
+def single_record_excel_file(tmp_path_factory, write_ema_xlsx) -> Path:
     """Creates a sample EMA data file with a single record."""
-    file_path = tmp_path / "single_record_ema_data.xlsx"
+    file_path = tmp_path_factory.mktemp("xlsx") / "single_record_ema_data.xlsx"
     data = {
         "Category": ["Human"],
         "Medicine name": ["TestMed Idempotent"],
@@ -197,6 +407,4 @@ def single_record_excel_file(tmp_path: Path) -> Path:
         "Marketing authorisation holder/company name": ["Idem Corp"],
         "URL": ["http://example.com/idem"],
     }
-    df = pd.DataFrame(data)
-    df.to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
+    return write_ema_xlsx(file_path, data)
@@ -1,11 +1,12 @@
+import psycopg2
 import pytest
 from unittest.mock import MagicMock, patch
 from py_load_epar.db.postgres import PostgresAdapter, StreamingIteratorIO
 from py_load_epar.config import DatabaseSettings
 import io
 
-# Mark all tests in this module as integration tests
-pytestmark = pytest.mark.integration
+# Tests that use the PostgreSQL container are marked as integration tests by
+# the root conftest; the rest of this module runs as plain unit tests.
 
 
 @pytest.fixture
@@ -91,6 +92,29 @@ def test_soft_delete_with_incomplete_settings(postgres_adapter: PostgresAdapter,
     mock_cursor.execute.assert_not_called()
 
 
+def test_bulk_load_batch_rolls_back_on_copy_failure(caplog):
+    """
+    Tests that bulk_load_batch rolls back the transaction and re-raises when the
+    COPY command fails, without needing a live database.
+    """
+    adapter = PostgresAdapter(DatabaseSettings())
+    adapter.conn = MagicMock()
+    mock_cursor = adapter.conn.cursor.return_value.__enter__.return_value
+    mock_cursor.copy_expert.side_effect = psycopg2.Error(
+        "Simulating a critical DB error during bulk load"
+    )
+
+    with pytest.raises(psycopg2.Error, match="Simulating a critical DB error"):
+        adapter.bulk_load_batch(
+            iter([("EMA/A/1", "TestMed A")]), "epar_index", ["epar_id", "medicine_name"]
+        )
+
+    mock_cursor.copy_expert.assert_called_once()
+    adapter.conn.rollback.assert_called_once()
+    adapter.conn.commit.assert_not_called()
+    assert "Bulk load failed" in caplog.text
+
+
 def test_streaming_iterator_read_all():
     """
     Tests the read(size=-1) case in the StreamingIteratorIO helper class.
@@ -104,3 +128,23 @@ def test_streaming_iterator_read_all():
     assert result == b"helloworldthis is a test"
     # After reading all, the internal buffer should be empty
     assert stream.read() == b""
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, "\\N"),
+        (42, "42"),
+        ("plain", "plain"),
+        ("a\\b", "a\\\\b"),
+        ("line1\nline2\r\n", "line1\\nline2\\r\\n"),
+        ("col\tcol", "col\\tcol"),
+    ],
+)
+def test_format_value_escapes_copy_text_specials(value, expected):
+    """
+    Tests that values are rendered for COPY's text format, with NULL written as
+    \\N and backslashes, newlines, carriage returns and tabs escaped.
+    """
+    adapter = PostgresAdapter(DatabaseSettings())
+    assert adapter._format_value(value) == expected
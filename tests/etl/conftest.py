@@ -0,0 +1,53 @@
+import io
+from typing import Any, Dict, Iterable, Optional, Tuple
+from unittest.mock import MagicMock
+
+import pytest
+
+
+class _NullSporClient:
+    """A SporApiClient stand-in that never finds a match and makes no HTTP calls."""
+
+    def search_organisation(self, *args: Any, **kwargs: Any) -> Optional[Any]:
+        return None
+
+    def search_substance(self, *args: Any, **kwargs: Any) -> Optional[Any]:
+        return None
+
+    def search_organisations(self, names: Iterable[str]) -> Dict[str, Optional[Any]]:
+        return dict.fromkeys(names)
+
+    def search_substances(self, names: Iterable[str]) -> Dict[str, Optional[Any]]:
+        return dict.fromkeys(names)
+
+    def preconnect(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def null_spor_client() -> _NullSporClient:
+    """Provides a SPOR client stub for ETL tests that do not exercise enrichment."""
+    return _NullSporClient()
+
+
+@pytest.fixture
+def patch_extract_io(mocker) -> Tuple[MagicMock, MagicMock]:
+    """
+    Patches the downloader and parser used by `extract_data`, so extraction tests
+    never touch the network, the filesystem or the Excel engine.
+
+    Returns the (download, parse) mocks. The download yields an empty in-memory
+    stream and the parser yields no records; tests set `parse.return_value` to
+    the parsed records they need.
+    """
+    mock_download = mocker.patch(
+        "py_load_epar.etl.extract.download_file_to_memory",
+        return_value=io.BytesIO(b""),
+    )
+    mock_parse = mocker.patch(
+        "py_load_epar.etl.extract.parse_ema_excel_file", return_value=iter([])
+    )
+    return mock_download, mock_parse
@@ -1,8 +1,8 @@
 # tests/etl/test_data_integrity.py
+import io
 import logging
 from pathlib import Path
 
-import pandas as pd
 import pytest
 import psycopg2
 
@@ -15,12 +15,12 @@ from py_load_epar.etl.orchestrator import run_etl
 pytestmark = pytest.mark.integration
 
 
-@pytest.fixture
-def sample_excel_file_with_invalid_date(tmp_path: Path) -> Path:
+@pytest.fixture(scope="session")
+def sample_excel_file_with_invalid_date(tmp_path_factory, write_ema_xlsx) -> Path:
     """
     Creates a sample EMA data file where one record has an invalid date format.
     """
-    file_path = tmp_path / "test_ema_data_invalid_date.xlsx"
+    file_path = tmp_path_factory.mktemp("xlsx") / "test_ema_data_invalid_date.xlsx"
     data = {
         "Category": ["Human", "Human", "Human"],
         "Medicine name": ["TestMed Valid 1", "TestMed Invalid Date", "TestMed Valid 2"],
@@ -52,15 +52,15 @@ def sample_excel_file_with_invalid_date(tmp_path: Path) -> Path:
             "http://example.com/valid2",
         ],
     }
-    df = pd.DataFrame(data)
-    df.to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
+    return write_ema_xlsx(file_path, data)
 
 
 def test_etl_with_invalid_data_type(
     postgres_adapter: PostgresAdapter,
     db_settings: Settings,
     mocker,
+    xlsx_bytes,
+    null_spor_client,
     sample_excel_file_with_invalid_date: Path,
     caplog,
 ):
@@ -72,11 +72,11 @@ def test_etl_with_invalid_data_type(
     # --- Mock dependencies ---
     mocker.patch(
         "py_load_epar.etl.extract.download_file_to_memory",
-        return_value=sample_excel_file_with_invalid_date.open("rb"),
+        return_value=io.BytesIO(xlsx_bytes(sample_excel_file_with_invalid_date)),
+    )
+    mocker.patch(
+        "py_load_epar.etl.orchestrator.SporApiClient", return_value=null_spor_client
     )
-    mock_spor_client = mocker.patch("py_load_epar.etl.orchestrator.SporApiClient")
-    mock_spor_client.return_value.search_organisation.return_value = None
-    mock_spor_client.return_value.search_substance.return_value = None
     mocker.patch("py_load_epar.etl.orchestrator._process_documents", return_value=0)
 
     # --- Run the ETL process ---
@@ -91,27 +91,29 @@ def test_etl_with_invalid_data_type(
     assert "'NOT A DATE'" in caplog.text
     assert "Skipping record" in caplog.text
 
-    # Verify that only the valid records were loaded
+    # Verify the loaded records in a single roundtrip: the total count, the
+    # count of the invalid record, and the IDs of the loaded records
     with postgres_adapter.conn.cursor() as cursor:
-        cursor.execute("SELECT COUNT(*) FROM epar_index")
-        assert cursor.fetchone()[0] == 2
-
-        # Verify that the invalid record is not in the database
         cursor.execute(
-            "SELECT COUNT(*) FROM epar_index WHERE epar_id = 'EMA/INVALID/1'"
+            """
+            SELECT
+                (SELECT COUNT(*) FROM epar_index),
+                (SELECT COUNT(*) FROM epar_index WHERE epar_id = 'EMA/INVALID/1'),
+                ARRAY(SELECT epar_id FROM epar_index ORDER BY epar_id)
+            """
         )
-        assert cursor.fetchone()[0] == 0
+        total, invalid, loaded_ids = cursor.fetchone()
 
-        # Verify that the valid records are in the database
-        cursor.execute("SELECT epar_id FROM epar_index ORDER BY epar_id")
-        loaded_ids = [row[0] for row in cursor.fetchall()]
-        assert loaded_ids == ["EMA/VALID/1", "EMA/VALID/2"]
+    # Only the valid records were loaded; the invalid record was rejected
+    assert total == 2
+    assert invalid == 0
+    assert loaded_ids == ["EMA/VALID/1", "EMA/VALID/2"]
 
 
-@pytest.fixture
-def valid_excel_file(tmp_path: Path) -> Path:
+@pytest.fixture(scope="session")
+def valid_excel_file(tmp_path_factory, write_ema_xlsx) -> Path:
     """Creates a sample EMA data file with only valid records."""
-    file_path = tmp_path / "valid_ema_data.xlsx"
+    file_path = tmp_path_factory.mktemp("xlsx") / "valid_ema_data.xlsx"
     data = {
         "Category": ["Human", "Human"],
         "Medicine name": ["TestMed A", "TestMed B"],
@@ -123,26 +125,26 @@ def valid_excel_file(tmp_path: Path) -> Path:
         "Revision date": ["2023-01-15", "2023-01-16"],
         "URL": ["http://example.com/a", "http://example.com/b"],
     }
-    df = pd.DataFrame(data)
-    df.to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
+    return write_ema_xlsx(file_path, data)
 
 
 def test_etl_transaction_rollback_on_failure(
     postgres_adapter: PostgresAdapter,
     db_settings: Settings,
     mocker,
+    xlsx_bytes,
     valid_excel_file: Path,
     caplog,
 ):
     """
-    Tests that if the bulk load process fails, the entire transaction is
-    rolled back, leaving the database in its initial state.
+    End-to-end smoke test that if the bulk load process fails, the entire
+    transaction is rolled back, leaving the database in its initial state.
+    The adapter-level rollback itself is unit tested in test_postgres_failures.
     """
     # --- Mock dependencies ---
     mocker.patch(
         "py_load_epar.etl.extract.download_file_to_memory",
-        return_value=valid_excel_file.open("rb"),
+        return_value=io.BytesIO(xlsx_bytes(valid_excel_file)),
     )
     mocker.patch("py_load_epar.etl.orchestrator.SporApiClient")
     mocker.patch("py_load_epar.etl.orchestrator._process_documents", return_value=0)
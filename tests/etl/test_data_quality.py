@@ -1,7 +1,6 @@
+import io
 from pathlib import Path
-from unittest.mock import MagicMock
 
-import pandas as pd
 import pytest
 
 from py_load_epar.config import Settings
@@ -12,8 +11,8 @@ from py_load_epar.etl.orchestrator import run_etl
 pytestmark = pytest.mark.integration
 
 
-@pytest.fixture
-def malformed_excel_file(tmp_path: Path) -> Path:
+@pytest.fixture(scope="session")
+def malformed_excel_file(tmp_path_factory, write_ema_xlsx) -> Path:
     """
     Creates a sample EMA data file with common data quality issues.
     - Row 1: Valid
@@ -21,7 +20,7 @@ def malformed_excel_file(tmp_path: Path) -> Path:
     - Row 3: Invalid date format
     - The 'URL' column is missing entirely.
     """
-    file_path = tmp_path / "malformed_ema_data.xlsx"
+    file_path = tmp_path_factory.mktemp("xlsx") / "malformed_ema_data.xlsx"
     data = {
         "Category": ["Human", "Human", "Human"],
         "Medicine name": ["TestMed Valid", None, "TestMed Invalid Date"],
@@ -45,15 +44,15 @@ def malformed_excel_file(tmp_path: Path) -> Path:
         ],
         # "URL" column is intentionally omitted
     }
-    df = pd.DataFrame(data)
-    df.to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
+    return write_ema_xlsx(file_path, data)
 
 
 def test_etl_resilience_to_data_quality_issues(
     postgres_adapter: PostgresAdapter,
     db_settings: Settings,
     mocker,
+    xlsx_bytes,
+    null_spor_client,
     malformed_excel_file: Path,
     caplog,
 ):
@@ -71,15 +70,12 @@ def test_etl_resilience_to_data_quality_issues(
     # Mock the download function to return our local malformed test file
     mocker.patch(
         "py_load_epar.etl.extract.download_file_to_memory",
-        return_value=malformed_excel_file.open("rb"),
+        return_value=io.BytesIO(xlsx_bytes(malformed_excel_file)),
     )
 
     # Mock the SPOR API client to avoid network calls
-    mock_spor_client = MagicMock()
-    mock_spor_client.search_organisation.return_value = None
-    mock_spor_client.search_substance.return_value = None
     mocker.patch(
-        "py_load_epar.etl.orchestrator.SporApiClient", return_value=mock_spor_client
+        "py_load_epar.etl.orchestrator.SporApiClient", return_value=null_spor_client
     )
     # Document processing is skipped because the 'URL' column is missing
     mock_process_docs = mocker.patch(
@@ -94,10 +90,10 @@ def test_etl_resilience_to_data_quality_issues(
         run_etl(settings)
 
 
-@pytest.fixture
-def single_good_record_file(tmp_path: Path) -> Path:
+@pytest.fixture(scope="session")
+def single_good_record_file(tmp_path_factory, write_ema_xlsx) -> Path:
     """Creates a valid, single-record EMA data file for testing."""
-    file_path = tmp_path / "single_good_record.xlsx"
+    file_path = tmp_path_factory.mktemp("xlsx") / "single_good_record.xlsx"
     data = {
         "Category": ["Human"],
         "Medicine name": ["TestMed Good"],
@@ -117,15 +113,15 @@ def single_good_record_file(tmp_path: Path) -> Path:
         "Marketing authorisation holder/company name": ["Good Corp"],
         "URL": ["http://example.com/good-medicine"],
     }
-    df = pd.DataFrame(data)
-    df.to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
+    return write_ema_xlsx(file_path, data)
 
 
 def test_process_documents_handles_page_with_no_pdf_links(
     postgres_adapter: PostgresAdapter,
     db_settings: Settings,
     mocker,
+    xlsx_bytes,
+    null_spor_client,
     caplog,
     single_good_record_file: Path,
 ):
@@ -137,13 +133,10 @@ def test_process_documents_handles_page_with_no_pdf_links(
     # Mock the file download and SPOR API
     mocker.patch(
         "py_load_epar.etl.extract.download_file_to_memory",
-        return_value=single_good_record_file.open("rb"),
+        return_value=io.BytesIO(xlsx_bytes(single_good_record_file)),
     )
-    mock_spor_client = MagicMock()
-    mock_spor_client.search_organisation.return_value = None
-    mock_spor_client.search_substance.return_value = None
     mocker.patch(
-        "py_load_epar.etl.orchestrator.SporApiClient", return_value=mock_spor_client
+        "py_load_epar.etl.orchestrator.SporApiClient", return_value=null_spor_client
     )
 
     # Mock the HTTP fetch to return a page with no PDF links
@@ -1,33 +1,84 @@
 import hashlib
+import shutil
+import threading
+import time
+import tracemalloc
+from io import BytesIO, RawIOBase
 from unittest.mock import MagicMock
 import logging
 
 import pytest
 import requests
+from tenacity import stop_after_attempt
+from urllib3.exceptions import ProtocolError
 
 from py_load_epar.etl.downloader import (
+    _SESSION,
     _download_file_to_stream,
+    _prefetched,
     download_document_and_hash,
     download_file_to_memory,
 )
 from py_load_epar.storage.interfaces import IStorage
 
+_CONTENT = b"some_pdf_content_for_testing"
+_HASH = hashlib.sha256(_CONTENT).hexdigest()
+_NO_FILENAME_CONTENT = b"some_content"
+_NO_FILENAME_HASH = hashlib.sha256(_NO_FILENAME_CONTENT).hexdigest()
+# Larger than several download chunks, so hashing runs across chunk boundaries.
+_LARGE_CONTENT = bytes(range(256)) * (16 * 1024)  # 4 MiB
+_LARGE_HASH = hashlib.sha256(_LARGE_CONTENT).hexdigest()
 
-def test_download_document_and_hash_with_mock_storage(requests_mock):
+
+def _download_to_dummy_stream(url: str) -> None:
+    """Runs the low-level streaming download into a throwaway buffer."""
+    _download_file_to_stream(url, BytesIO())
+
+
+@pytest.mark.parametrize(
+    "url, content, expected_hash, expected_object_name",
+    [
+        (
+            "https://fake-ema-url.com/document.pdf",
+            _CONTENT,
+            _HASH,
+            "documents/document.pdf",
+        ),
+        # A default filename is used when the URL has no path.
+        (
+            "http://fake-ema-url.com/",
+            _NO_FILENAME_CONTENT,
+            _NO_FILENAME_HASH,
+            "documents/downloaded_document",
+        ),
+        (
+            "https://fake-ema-url.com/large_document.pdf",
+            _LARGE_CONTENT,
+            _LARGE_HASH,
+            "documents/large_document.pdf",
+        ),
+    ],
+)
+def test_download_document_and_hash_with_mock_storage(
+    requests_mock, url, content, expected_hash, expected_object_name
+):
     """
     Test that a document is downloaded, hashed, and saved via a mock storage adapter.
     """
-    url = "https://fake-ema-url.com/document.pdf"
-    mock_content = b"some_pdf_content_for_testing"
-    requests_mock.get(url, content=mock_content)
+    requests_mock.get(url, content=content)
 
-    # Create a mock storage object that adheres to the IStorage interface
+    # Create a mock storage object that adheres to the IStorage interface. Like a
+    # real adapter, it consumes the stream while saving.
     mock_storage = MagicMock(spec=IStorage)
-    expected_uri = "mock://storage/documents/document.pdf"
-    mock_storage.save.return_value = expected_uri
+    expected_uri = f"mock://storage/{expected_object_name}"
+    saved_chunks = []
+
+    def _save(data_stream, object_name):
+        data_stream.seek(0)
+        saved_chunks.append(data_stream.read())
+        return expected_uri
 
-    # Calculate the expected hash
-    expected_hash = hashlib.sha256(mock_content).hexdigest()
+    mock_storage.save.side_effect = _save
 
     # Call the function with the mock storage
     storage_uri, file_hash = download_document_and_hash(url, mock_storage)
@@ -40,27 +91,114 @@ def test_download_document_and_hash_with_mock_storage(requests_mock):
     # 2. Check that the 'save' method on the mock storage was called correctly
     mock_storage.save.assert_called_once()
 
-    # 3. Inspect the arguments passed to the 'save' method
+    # 3. Inspect the arguments passed to the 'save' method and the saved content
     call_args = mock_storage.save.call_args
-    saved_stream = call_args.kwargs['data_stream']
-    saved_object_name = call_args.kwargs['object_name']
+    saved_object_name = call_args.kwargs["object_name"]
+
+    assert saved_chunks == [content]
+    assert saved_object_name == expected_object_name
+
+
+@pytest.mark.parametrize(
+    "content, headers, expect_in_memory",
+    [
+        (_CONTENT, {"Content-Length": str(len(_CONTENT))}, True),
+        (_LARGE_CONTENT, {"Content-Length": str(len(_LARGE_CONTENT))}, False),
+        # Without a declared size the body is always streamed.
+        (_CONTENT, {}, False),
+    ],
+)
+def test_download_document_and_hash_reads_small_bodies_in_one_go(
+    requests_mock, content, headers, expect_in_memory
+):
+    """
+    Test that documents declaring a small Content-Length are saved from memory,
+    while larger or unsized ones go through the streaming reader.
+    """
+    url = "https://fake-ema-url.com/document.pdf"
+    requests_mock.get(url, content=content, headers=headers)
+
+    mock_storage = MagicMock(spec=IStorage)
+    saved = {}
+
+    def _save(data_stream, object_name):
+        saved["in_memory"] = isinstance(data_stream, BytesIO)
+        data_stream.seek(0)
+        saved["content"] = data_stream.read()
+        return f"mock://storage/{object_name}"
+
+    mock_storage.save.side_effect = _save
+
+    _, file_hash = download_document_and_hash(url, mock_storage)
+
+    assert file_hash == hashlib.sha256(content).hexdigest()
+    assert saved == {"in_memory": expect_in_memory, "content": content}
+
+
+def test_download_document_and_hash_streams_without_buffering(requests_mock):
+    """
+    Test that a large document is streamed into storage and hashed on the way
+    through, without the whole payload being buffered in memory.
+    """
+    url = "https://fake-ema-url.com/large.pdf"
+    content = bytes(range(256)) * (128 * 1024)  # 32 MiB
+    requests_mock.get(url, content=content)
 
-    assert saved_stream.read() == mock_content
-    assert saved_object_name == "documents/document.pdf"
+    sink_hasher = hashlib.sha256()
 
+    class _HashingSink:
+        def write(self, chunk):
+            sink_hasher.update(chunk)
 
+    mock_storage = MagicMock(spec=IStorage)
+
+    def _save(data_stream, object_name):
+        data_stream.seek(0)
+        shutil.copyfileobj(data_stream, _HashingSink(), 1024 * 1024)
+        return f"mock://storage/{object_name}"
+
+    mock_storage.save.side_effect = _save
 
-def test_download_raises_exception_on_http_error(requests_mock):
-    """Test that the downloader raises an exception for a 404 error."""
-    url = "https://fake-ema-url.com/not_found"
-    requests_mock.get(url, status_code=404)
+    tracemalloc.start()
+    try:
+        _, file_hash = download_document_and_hash(url, mock_storage)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
 
-    with pytest.raises(Exception):
-        # Use a dummy file stream for the test
-        from io import BytesIO
+    assert file_hash == sink_hasher.hexdigest() == hashlib.sha256(content).hexdigest()
+    # Only the prefetch queue and a few chunks in flight are ever alive at once,
+    # never a full copy of the body.
+    assert peak < len(content) // 2
+
+
+@pytest.mark.parametrize(
+    "url, response, download, expected_exception",
+    [
+        # The low-level downloader raises for a 404 error.
+        (
+            "https://fake-ema-url.com/not_found",
+            {"status_code": 404},
+            _download_to_dummy_stream,
+            requests.exceptions.HTTPError,
+        ),
+        # The public downloader surfaces a requests.Timeout once retries run out.
+        (
+            "https://fake-ema-url.com/timeout",
+            {"exc": requests.exceptions.Timeout},
+            download_file_to_memory,
+            requests.exceptions.Timeout,
+        ),
+    ],
+)
+def test_download_raises_on_failure(
+    requests_mock, url, response, download, expected_exception
+):
+    """Test that the downloaders re-raise HTTP errors and timeouts."""
+    requests_mock.get(url, **response)
 
-        dummy_stream = BytesIO()
-        _download_file_to_stream(url, dummy_stream)
+    with pytest.raises(expected_exception):
+        download(url)
 
 
 def test_download_retries_on_transient_error(requests_mock, caplog):
@@ -97,31 +235,80 @@ def test_download_retries_on_transient_error(requests_mock, caplog):
     assert "Successfully downloaded file" in caplog.text
 
 
-def test_download_handles_timeout(requests_mock):
+def test_downloads_share_a_pooled_session_without_transport_retries():
+    """
+    Test that the module-level session pools connections for both HTTP and
+    HTTPS and leaves retrying to the download functions, so failed requests are
+    not retried twice over.
+    """
+    for prefix in ("http://", "https://"):
+        adapter = _SESSION.get_adapter(f"{prefix}fake-ema-url.com/")
+        assert adapter._pool_maxsize == 32
+        assert adapter.max_retries.total == 0
+
+
+def test_prefetched_chunks_reraise_read_errors_in_order():
+    """
+    Test that chunks read on the background thread arrive in order and that a
+    read error is re-raised to the consumer after the chunks before it.
+    """
+
+    def _chunks():
+        yield b"first"
+        yield b"second"
+        raise requests.exceptions.ChunkedEncodingError("Connection broken")
+
+    received = []
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        with _prefetched(_chunks(), depth=1) as chunks:
+            for chunk in chunks:
+                received.append(chunk)
+
+    assert received == [b"first", b"second"]
+
+
+def test_prefetched_exit_does_not_wait_for_a_blocked_read():
     """
-    Test that the downloader handles a requests.Timeout correctly.
+    Test that leaving the prefetch context early returns promptly even while the
+    reader thread is blocked on a read that has not timed out yet.
     """
-    url = "https://fake-ema-url.com/timeout"
-    requests_mock.get(url, exc=requests.exceptions.Timeout)
+    release = threading.Event()
+
+    def _chunks():
+        yield b"first"
+        # Stands in for a socket read that only ends with the read timeout.
+        release.wait(timeout=30)
+        yield b"second"
 
-    with pytest.raises(requests.exceptions.Timeout):
-        download_file_to_memory(url)
+    try:
+        start = time.perf_counter()
+        with _prefetched(_chunks(), depth=1) as chunks:
+            assert next(chunks) == b"first"
+        assert time.perf_counter() - start < 5
+    finally:
+        release.set()
 
 
-def test_download_with_no_filename_in_url(requests_mock):
+def test_download_logs_and_wraps_errors_partway_through_the_body(
+    requests_mock, caplog
+):
     """
-    Test that a default filename is used when the URL has no path.
+    Test that a connection dropped while the body is being read surfaces as a
+    requests exception, and so is logged like any other download failure.
     """
-    url = "http://fake-ema-url.com/"
-    mock_content = b"some_content"
-    requests_mock.get(url, content=mock_content)
 
-    mock_storage = MagicMock(spec=IStorage)
-    mock_storage.save.return_value = "mock://storage/documents/downloaded_document"
+    class _BrokenBody(RawIOBase):
+        def readable(self):
+            return True
 
-    download_document_and_hash(url, mock_storage)
+        def readinto(self, buffer):
+            raise ProtocolError("Connection broken: IncompleteRead")
 
-    mock_storage.save.assert_called_once()
-    call_args = mock_storage.save.call_args
-    saved_object_name = call_args.kwargs["object_name"]
-    assert saved_object_name == "documents/downloaded_document"
+    url = "https://fake-ema-url.com/broken"
+    requests_mock.get(url, body=_BrokenBody())
+    download_once = _download_file_to_stream.retry_with(stop=stop_after_attempt(1))
+
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        download_once(url, BytesIO())
+
+    assert f"Failed to download file from {url}" in caplog.text
@@ -1,12 +1,10 @@
 # tests/etl/test_edge_cases.py
 
-import pandas as pd
 import pytest
 from pathlib import Path
 import logging
-from unittest.mock import MagicMock
-from multiprocessing import Process
-import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
 
 from py_load_epar.config import Settings
 from py_load_epar.db.postgres import PostgresAdapter
@@ -15,10 +13,10 @@ from py_load_epar.etl.orchestrator import run_etl
 # Mark all tests in this module as integration tests
 pytestmark = pytest.mark.integration
 
-@pytest.fixture
-def malformed_excel_file(tmp_path: Path) -> Path:
+@pytest.fixture(scope="session")
+def malformed_excel_file(tmp_path_factory, write_ema_xlsx) -> Path:
     """Creates a malformed Excel file with missing required columns."""
-    file_path = tmp_path / "malformed_ema_data.xlsx"
+    file_path = tmp_path_factory.mktemp("xlsx") / "malformed_ema_data.xlsx"
     data = {
         "Category": ["Human"],
         "Medicine name": ["TestMed Malformed"],
@@ -29,9 +27,7 @@ def malformed_excel_file(tmp_path: Path) -> Path:
         "URL": ["http://example.com/malformed"],
         "Revision date": ["2023-01-01"],
     }
-    df = pd.DataFrame(data)
-    df.to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
+    return write_ema_xlsx(file_path, data)
 
 def test_etl_with_malformed_data(
     postgres_adapter: PostgresAdapter,
@@ -68,10 +64,9 @@ def test_etl_with_malformed_data(
         cursor.execute("SELECT COUNT(*) FROM epar_index")
         assert cursor.fetchone()[0] == 0
 
-@pytest.fixture
-def delta_excel_file_1(tmp_path: Path) -> Path:
-    """Creates the initial version of an Excel file for delta load testing."""
-    file_path = tmp_path / "delta_data_1.xlsx"
+@pytest.fixture(scope="session")
+def delta_records_1(ema_records) -> List[Dict[str, Any]]:
+    """Builds the parsed initial version of the source data for delta load testing."""
     data = {
         "Category": ["Human", "Human"],
         "Medicine name": ["DeltaMed v1", "StableMed"],
@@ -83,14 +78,12 @@ def delta_excel_file_1(tmp_path: Path) -> Path:
         "Revision date": ["2023-01-15", "2023-02-15"],
         "URL": ["http://example.com/delta1", "http://example.com/stable"],
     }
-    pd.DataFrame(data).to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
+    return ema_records(data)
 
 
-@pytest.fixture
-def delta_excel_file_2(tmp_path: Path) -> Path:
-    """Creates the updated version of an Excel file for delta load testing."""
-    file_path = tmp_path / "delta_data_2.xlsx"
+@pytest.fixture(scope="session")
+def delta_records_2(ema_records) -> List[Dict[str, Any]]:
+    """Builds the parsed updated version of the source data for delta load testing."""
     data = {
         "Category": ["Human", "Human", "Human"],
         "Medicine name": ["DeltaMed v2", "StableMed", "NewMed"],
@@ -102,16 +95,16 @@ def delta_excel_file_2(tmp_path: Path) -> Path:
         "Revision date": ["2023-01-20", "2023-02-15", "2023-03-15"], # Revision date updated for DeltaMed
         "URL": ["http://example.com/delta2", "http://example.com/stable", "http://example.com/new"],
     }
-    pd.DataFrame(data).to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
+    return ema_records(data)
 
 
 def test_delta_load_logic(
     postgres_adapter: PostgresAdapter,
     db_settings: Settings,
     mocker,
-    delta_excel_file_1: Path,
-    delta_excel_file_2: Path,
+    patch_ema_source,
+    delta_records_1: List[Dict[str, Any]],
+    delta_records_2: List[Dict[str, Any]],
 ):
     """
     Tests the 'DELTA' load strategy.
@@ -120,103 +113,92 @@ def test_delta_load_logic(
     3. Asserts that only the new/updated records are processed.
     """
     # Mock dependencies
-    mock_download = mocker.patch("py_load_epar.etl.extract.download_file_to_memory")
     mocker.patch("py_load_epar.etl.orchestrator.SporApiClient")
     mocker.patch("py_load_epar.etl.orchestrator._process_documents", return_value=0)
 
     # --- 1. Initial FULL load ---
-    mock_download.return_value = delta_excel_file_1.open("rb")
+    patch_ema_source(delta_records_1)
     settings = db_settings
     settings.etl.load_strategy = "FULL"
     run_etl(settings)
 
     with postgres_adapter.conn.cursor() as cursor:
-        cursor.execute("SELECT COUNT(*) FROM epar_index")
-        assert cursor.fetchone()[0] == 2
-        cursor.execute("SELECT medicine_name FROM epar_index WHERE epar_id = 'EMA/DELTA/1'")
-        assert cursor.fetchone()[0] == "DeltaMed v1"
+        cursor.execute(
+            "SELECT COUNT(*), "
+            "(SELECT medicine_name FROM epar_index WHERE epar_id = 'EMA/DELTA/1') "
+            "FROM epar_index"
+        )
+        assert cursor.fetchone() == (2, "DeltaMed v1")
 
     # --- 2. DELTA load with updated file ---
-    mock_download.return_value = delta_excel_file_2.open("rb")
+    patch_ema_source(delta_records_2)
     settings.etl.load_strategy = "DELTA"
     run_etl(settings)
 
     # --- 3. Assertions ---
+    # Fetch every value under test in a single round trip.
     with postgres_adapter.conn.cursor() as cursor:
-        cursor.execute("SELECT COUNT(*) FROM epar_index")
-        assert cursor.fetchone()[0] == 3 # One new record was added
-
-        # Check that the updated record was modified
-        cursor.execute("SELECT medicine_name, source_url FROM epar_index WHERE epar_id = 'EMA/DELTA/1'")
-        name, url = cursor.fetchone()
-        assert name == "DeltaMed v2"
-        assert url == "http://example.com/delta2"
-
-        # Check that the stable record was not modified (e.g., by checking a field that doesn't change)
-        cursor.execute("SELECT therapeutic_area FROM epar_index WHERE epar_id = 'EMA/STABLE/1'")
-        assert cursor.fetchone()[0] == "Dermatology"
-
-        # Check that the new record was inserted
-        cursor.execute("SELECT medicine_name FROM epar_index WHERE epar_id = 'EMA/NEW/1'")
-        assert cursor.fetchone()[0] == "NewMed"
-
-def etl_process_runner(settings: Settings, excel_file: Path):
-    """A wrapper function to run the ETL process for concurrency testing."""
-    # Each process needs its own mocks, especially for external clients.
-    from unittest.mock import patch, MagicMock
-
-    # Create a mock instance for the SPOR API client
-    mock_spor_client = MagicMock()
-    mock_spor_client.search_organisation.return_value = None
-    mock_spor_client.search_substance.return_value = None
-
-    with patch("py_load_epar.etl.extract.download_file_to_memory", return_value=excel_file.open("rb")), \
-         patch("py_load_epar.etl.orchestrator.SporApiClient", return_value=mock_spor_client), \
-         patch("py_load_epar.etl.orchestrator._process_documents", return_value=0):
-        try:
-            run_etl(settings)
-        except Exception as e:
-            # Log exceptions to stderr to make them visible in pytest output
-            import sys
-            print(f"ETL process failed in child process: {e}", file=sys.stderr)
-            raise
+        cursor.execute(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM epar_index),
+                d.medicine_name,
+                d.source_url,
+                (SELECT therapeutic_area FROM epar_index WHERE epar_id = 'EMA/STABLE/1'),
+                (SELECT medicine_name FROM epar_index WHERE epar_id = 'EMA/NEW/1')
+            FROM epar_index AS d
+            WHERE d.epar_id = 'EMA/DELTA/1'
+            """
+        )
+        count, name, url, stable_area, new_name = cursor.fetchone()
+
+    assert count == 3 # One new record was added
+
+    # Check that the updated record was modified
+    assert name == "DeltaMed v2"
+    assert url == "http://example.com/delta2"
+
+    # Check that the stable record was not modified (e.g., by checking a field that doesn't change)
+    assert stable_area == "Dermatology"
+
+    # Check that the new record was inserted
+    assert new_name == "NewMed"
 
 
 def test_concurrent_full_loads(
     postgres_adapter: PostgresAdapter,
     db_settings: Settings,
+    mocker,
     single_record_excel_file: Path, # Reusing this fixture from another test file
 ):
     """
     Tests that running two FULL loads concurrently does not corrupt the database.
-    The final state should be as if only one process ran, thanks to transaction
+    The final state should be as if only one run happened, thanks to transaction
     management and UPSERT logic.
     """
+    # Threads share the process, so these patches apply to both workers. Each
+    # run gets its own file handle to read the workbook from.
+    mocker.patch(
+        "py_load_epar.etl.extract.download_file_to_memory",
+        side_effect=lambda url: single_record_excel_file.open("rb"),
+    )
+    mock_spor_client = mocker.patch("py_load_epar.etl.orchestrator.SporApiClient")
+    mock_spor_client.return_value.search_organisation.return_value = None
+    mock_spor_client.return_value.search_substance.return_value = None
+    mocker.patch("py_load_epar.etl.orchestrator._process_documents", return_value=0)
+
     settings = db_settings
     settings.etl.load_strategy = "FULL"
 
-    # Create and start two processes running the ETL
-    process1 = Process(target=etl_process_runner, args=(settings, single_record_excel_file))
-    process2 = Process(target=etl_process_runner, args=(settings, single_record_excel_file))
-
-    process1.start()
-    process2.start()
-
-    process1.join(timeout=60)
-    process2.join(timeout=60)
-
-    assert process1.exitcode == 0
-    assert process2.exitcode == 0
+    # Run the ETL twice at the same time; the database connections are opened
+    # per run, so the loads contend on the database just like separate processes.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(run_etl, settings) for _ in range(2)]
+        for future in futures:
+            future.result(timeout=60)
 
     # --- Assert final database state ---
-    # Give a moment for any final commits to settle
-    time.sleep(1)
-
+    # Should only be one record in the table, and its data should be correct
     with postgres_adapter.conn.cursor() as cursor:
-        # Should only be one record in the table
-        cursor.execute("SELECT COUNT(*) FROM epar_index")
-        assert cursor.fetchone()[0] == 1
-
-        # Verify the data is correct
-        cursor.execute("SELECT medicine_name FROM epar_index WHERE epar_id = 'EMA/IDEM'")
-        assert cursor.fetchone()[0] == "TestMed Idempotent"
+        cursor.execute("SELECT epar_id, medicine_name FROM epar_index")
+        assert cursor.fetchall() == [("EMA/IDEM", "TestMed Idempotent")]
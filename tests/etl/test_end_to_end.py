@@ -1,7 +1,6 @@
 from pathlib import Path
 from unittest.mock import MagicMock
 
-import pandas as pd
 import pytest
 
 from py_load_epar.config import Settings
@@ -14,7 +13,7 @@ pytestmark = pytest.mark.integration
 
 
 @pytest.fixture
-def sample_excel_file(tmp_path: Path) -> Path:
+def sample_excel_file(tmp_path: Path, write_ema_xlsx) -> Path:
     """Creates a sample EMA data file for testing."""
     file_path = tmp_path / "test_ema_data.xlsx"
     data = {
@@ -40,9 +39,7 @@ def sample_excel_file(tmp_path: Path) -> Path:
         ],
         "URL": ["http://example.com/1", "http://example.com/2", "http://example.com/3"],
     }
-    df = pd.DataFrame(data)
-    df.to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
+    return write_ema_xlsx(file_path, data)
 
 
 def test_full_etl_run_with_enrichment_and_soft_delete(
@@ -154,6 +151,7 @@ def test_document_processing(
     db_settings: Settings,
     mocker,
     tmp_path: Path,
+    write_ema_xlsx,
 ):
     """
     Tests the document processing part of the ETL.
@@ -181,9 +179,7 @@ def test_document_processing(
         "Marketing authorisation holder/company name": ["Richards Pharma"],
         "URL": ["http://example.com/3"],
     }
-    pd.DataFrame(data).to_excel(
-        file_path, index=False, sheet_name="Medicines for human use"
-    )
+    write_ema_xlsx(file_path, data)
 
     # --- 2. Mock external dependencies ---
     mocker.patch(
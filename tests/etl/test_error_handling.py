@@ -1,6 +1,7 @@
-import pandas as pd
+import logging
+from typing import Any, Dict, List
+
 import pytest
-from pathlib import Path
 from pydantic import ValidationError
 
 from py_load_epar.config import Settings
@@ -10,10 +11,22 @@ from py_load_epar.etl.orchestrator import run_etl
 # Mark all tests in this module as integration tests
 pytestmark = pytest.mark.integration
 
-@pytest.fixture
-def malformed_excel_file(tmp_path: Path) -> Path:
-    """Creates a malformed EMA data file with a missing required column."""
-    file_path = tmp_path / "malformed_ema_data.xlsx"
+
+@pytest.fixture(autouse=True)
+def mock_spor_client(mocker):
+    """
+    Replaces the SPOR client for every test in this module with a mock that finds
+    no matches. Tests that need the API to fail override its search methods.
+    """
+    mock_spor_client = mocker.patch("py_load_epar.etl.orchestrator.SporApiClient")
+    mock_spor_client.return_value.search_organisation.return_value = None
+    mock_spor_client.return_value.search_substance.return_value = None
+    return mock_spor_client
+
+
+@pytest.fixture(scope="session")
+def malformed_records(ema_records) -> List[Dict[str, Any]]:
+    """Builds the parsed records of a malformed EMA data file missing a column."""
     data = {
         "Category": ["Human"],
         "Medicine name": ["TestMed A"],
@@ -33,26 +46,21 @@ def malformed_excel_file(tmp_path: Path) -> Path:
         "Marketing authorisation holder/company name": ["PharmaCo"],
         "URL": ["http://example.com/1"],
     }
-    df = pd.DataFrame(data)
-    df.to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
+    return ema_records(data)
 
 def test_malformed_excel_file(
     postgres_adapter: PostgresAdapter,
     db_settings: Settings,
     mocker,
-    malformed_excel_file: Path,
+    patch_ema_source,
+    malformed_records: List[Dict[str, Any]],
 ):
     """
     Tests that the ETL process fails gracefully when the Excel file is malformed.
     """
     # --- Mock dependencies ---
-    mock_spor_client = mocker.patch("py_load_epar.etl.orchestrator.SporApiClient")
-    mock_spor_client.return_value.search_organisation.return_value = None
-    mock_spor_client.return_value.search_substance.return_value = None
     mocker.patch("py_load_epar.etl.orchestrator._process_documents", return_value=0)
-    mock_download = mocker.patch("py_load_epar.etl.extract.download_file_to_memory")
-    mock_download.return_value = malformed_excel_file.open("rb")
+    patch_ema_source(malformed_records)
 
     # --- Run ETL and assert it fails ---
     settings = db_settings
@@ -70,22 +78,19 @@ def test_document_download_failure(
     postgres_adapter: PostgresAdapter,
     db_settings: Settings,
     mocker,
-    sample_excel_file_for_spor_test: Path, # Reusing a simple, valid file
+    patch_ema_source,
+    spor_test_records: List[Dict[str, Any]], # Reusing a simple, valid file
     caplog,
 ):
     """
     Tests that if a document download fails, the ETL continues and logs the error,
     but does not fail the entire process.
     """
+    # Only warnings and errors are asserted on; skip capturing INFO/DEBUG records.
+    caplog.set_level(logging.WARNING, logger="py_load_epar")
     # --- Mock dependencies ---
-    # Mock the SPOR API to return nothing
-    mock_spor_client = mocker.patch("py_load_epar.etl.orchestrator.SporApiClient")
-    mock_spor_client.return_value.search_organisation.return_value = None
-    mock_spor_client.return_value.search_substance.return_value = None
-
-    # Mock the download of the source excel file
-    mock_download = mocker.patch("py_load_epar.etl.extract.download_file_to_memory")
-    mock_download.return_value = sample_excel_file_for_spor_test.open("rb")
+    # Mock the source excel file
+    patch_ema_source(spor_test_records)
 
     # Mock the HTML fetching to return a page with a PDF link
     pdf_url = "http://example.com/non_existent_document.pdf"
@@ -106,27 +111,22 @@ def test_document_download_failure(
     run_etl(settings)
 
     # --- Assertions ---
-    # Assert that the main record was still loaded
-    with postgres_adapter.conn.cursor() as cursor:
-        cursor.execute("SELECT COUNT(*) FROM epar_index")
-        assert cursor.fetchone()[0] == 1
-        cursor.execute("SELECT epar_id FROM epar_index")
-        assert cursor.fetchone()[0] == "EMA/SPOR"
-
-    # Assert that no document was loaded
+    # Assert that the main record was still loaded, but no document was
     with postgres_adapter.conn.cursor() as cursor:
-        cursor.execute("SELECT COUNT(*) FROM epar_documents")
-        assert cursor.fetchone()[0] == 0
+        cursor.execute(
+            "SELECT ARRAY(SELECT epar_id FROM epar_index), "
+            "(SELECT COUNT(*) FROM epar_documents)"
+        )
+        assert cursor.fetchone() == (["EMA/SPOR"], 0)
 
     # Assert that the error was logged
-        assert "Failed to process document link" in caplog.text
+    assert "Failed to process document link" in caplog.text
     assert "Simulated download failure" in caplog.text
 
 
-@pytest.fixture
-def sample_excel_file_for_spor_test(tmp_path: Path) -> Path:
-    """Creates a sample EMA data file for SPOR API error handling test."""
-    file_path = tmp_path / "sample_ema_data_spor.xlsx"
+@pytest.fixture(scope="session")
+def spor_test_records(ema_records) -> List[Dict[str, Any]]:
+    """Builds the parsed records of a sample EMA data file for SPOR API tests."""
     data = {
         "Category": ["Human"],
         "Medicine name": ["TestMed SPOR"],
@@ -146,26 +146,24 @@ def sample_excel_file_for_spor_test(tmp_path: Path) -> Path:
         "Marketing authorisation holder/company name": ["PharmaCo SPOR"],
         "URL": ["http://example.com/spor"],
     }
-    df = pd.DataFrame(data)
-    df.to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
+    return ema_records(data)
 
 
 def test_spor_api_error_handling(
     postgres_adapter: PostgresAdapter,
     db_settings: Settings,
     mocker,
-    sample_excel_file_for_spor_test: Path,
+    patch_ema_source,
+    mock_spor_client,
+    spor_test_records: List[Dict[str, Any]],
 ):
     """
     Tests that the ETL process handles SPOR API errors gracefully.
     """
     # --- Mock dependencies ---
-    mock_spor_client = mocker.patch("py_load_epar.etl.orchestrator.SporApiClient")
     mock_spor_client.return_value.search_organisation.side_effect = Exception("SPOR API is down")
     mocker.patch("py_load_epar.etl.orchestrator._process_documents", return_value=0)
-    mock_download = mocker.patch("py_load_epar.etl.extract.download_file_to_memory")
-    mock_download.return_value = sample_excel_file_for_spor_test.open("rb")
+    patch_ema_source(spor_test_records)
 
     # --- Run ETL ---
     settings = db_settings
@@ -174,16 +172,13 @@ def test_spor_api_error_handling(
 
     # --- Assert that data was loaded without enrichment ---
     with postgres_adapter.conn.cursor() as cursor:
-        cursor.execute("SELECT COUNT(*) FROM epar_index")
-        assert cursor.fetchone()[0] == 1
-        cursor.execute("SELECT mah_oms_id FROM epar_index WHERE epar_id = 'EMA/SPOR'")
-        assert cursor.fetchone()[0] is None
+        cursor.execute("SELECT epar_id, mah_oms_id FROM epar_index")
+        assert cursor.fetchall() == [("EMA/SPOR", None)]
 
 
-@pytest.fixture
-def invalid_data_type_excel_file(tmp_path: Path) -> Path:
-    """Creates a file with an invalid data type in a date column."""
-    file_path = tmp_path / "invalid_data_type.xlsx"
+@pytest.fixture(scope="session")
+def invalid_data_type_records(ema_records) -> List[Dict[str, Any]]:
+    """Builds the parsed records of a file with an invalid value in a date column."""
     data = {
         "Category": ["Human", "Human"],
         "Medicine name": ["TestMed Valid", "TestMed Invalid Date"],
@@ -203,29 +198,25 @@ def invalid_data_type_excel_file(tmp_path: Path) -> Path:
         "Marketing authorisation holder/company name": ["PharmaCo", "BioGen"],
         "URL": ["http://example.com/1", "http://example.com/2"],
     }
-    df = pd.DataFrame(data)
-    df.to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
+    return ema_records(data)
 
 
 def test_invalid_data_type_in_excel(
     postgres_adapter: PostgresAdapter,
     db_settings: Settings,
     mocker,
-    invalid_data_type_excel_file: Path,
+    patch_ema_source,
+    invalid_data_type_records: List[Dict[str, Any]],
     caplog,
 ):
     """
     Tests that the ETL process handles invalid data types gracefully.
     It should skip the invalid record but continue to process valid ones.
     """
+    caplog.set_level(logging.WARNING, logger="py_load_epar")
     # --- Mock dependencies ---
-    mock_spor_client = mocker.patch("py_load_epar.etl.orchestrator.SporApiClient")
-    mock_spor_client.return_value.search_organisation.return_value = None
-    mock_spor_client.return_value.search_substance.return_value = None
     mocker.patch("py_load_epar.etl.orchestrator._process_documents", return_value=0)
-    mock_download = mocker.patch("py_load_epar.etl.extract.download_file_to_memory")
-    mock_download.return_value = invalid_data_type_excel_file.open("rb")
+    patch_ema_source(invalid_data_type_records)
 
     # --- Run ETL ---
     settings = db_settings
@@ -235,10 +226,8 @@ def test_invalid_data_type_in_excel(
     # --- Assertions ---
     # Assert that the valid record was loaded
     with postgres_adapter.conn.cursor() as cursor:
-        cursor.execute("SELECT COUNT(*) FROM epar_index")
-        assert cursor.fetchone()[0] == 1
         cursor.execute("SELECT epar_id FROM epar_index")
-        assert cursor.fetchone()[0] == "EMA/1"
+        assert cursor.fetchall() == [("EMA/1",)]
 
     # Assert that a warning was logged for the invalid record
     assert "Could not parse marketing_authorisation_date" in caplog.text
@@ -249,13 +238,15 @@ def test_database_transaction_integrity(
     postgres_adapter: PostgresAdapter,
     db_settings: Settings,
     mocker,
-    sample_excel_file_for_spor_test: Path, # Reusing a simple, valid file
+    patch_ema_source,
+    spor_test_records: List[Dict[str, Any]], # Reusing a simple, valid file
     caplog,
 ):
     """
     Tests that if a database error occurs during the load, the transaction
     is rolled back and no data is left in the database.
     """
+    caplog.set_level(logging.WARNING, logger="py_load_epar")
     # --- Mock dependencies ---
     # Mock the bulk_load_batch method to raise a DB error
     mocker.patch(
@@ -263,12 +254,8 @@ def test_database_transaction_integrity(
         side_effect=Exception("Simulated database error"),
     )
     # Mock other dependencies to isolate the database logic
-    mock_spor_client = mocker.patch("py_load_epar.etl.orchestrator.SporApiClient")
-    mock_spor_client.return_value.search_organisation.return_value = None
-    mock_spor_client.return_value.search_substance.return_value = None
     mocker.patch("py_load_epar.etl.orchestrator._process_documents", return_value=0)
-    mock_download = mocker.patch("py_load_epar.etl.extract.download_file_to_memory")
-    mock_download.return_value = sample_excel_file_for_spor_test.open("rb")
+    patch_ema_source(spor_test_records)
 
     # --- Run ETL and assert it raises the expected exception ---
     settings = db_settings
@@ -1,41 +1,43 @@
 import datetime
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, MagicMock, patch
 
 import pytest
 
 from py_load_epar.config import Settings
 from py_load_epar.etl.orchestrator import run_etl
-from py_load_epar.models import EparIndex, EparSubstanceLink
 from py_load_epar.spor_api.client import SporApiClient
 from py_load_epar.storage.interfaces import IStorage
 
 
-@patch("py_load_epar.etl.orchestrator.StorageFactory")
-@patch("py_load_epar.etl.orchestrator.SporApiClient")
-@patch("py_load_epar.etl.orchestrator.get_db_adapter")
-@patch("py_load_epar.etl.orchestrator.extract_data")
-@patch("py_load_epar.etl.orchestrator.transform_and_validate")
-@patch("py_load_epar.etl.orchestrator._process_organizations")
-@patch("py_load_epar.etl.orchestrator._process_substances")
-@patch("py_load_epar.etl.orchestrator._process_substance_links")
-@patch("py_load_epar.etl.orchestrator._process_documents")
-def test_run_etl_successful_flow(
-    mock_process_docs,
-    mock_process_links,
-    mock_process_substances,
-    mock_process_orgs,
-    mock_transform,
-    mock_extract,
-    mock_get_adapter,
-    mock_spor_client_class,
-    mock_storage_factory,
-):
+@patch.multiple(
+    "py_load_epar.etl.orchestrator",
+    StorageFactory=DEFAULT,
+    SporApiClient=DEFAULT,
+    get_db_adapter=DEFAULT,
+    extract_data=DEFAULT,
+    transform_and_validate=DEFAULT,
+    _process_organizations=DEFAULT,
+    _process_substances=DEFAULT,
+    _process_substance_links=DEFAULT,
+    _process_documents=DEFAULT,
+)
+def test_run_etl_successful_flow(settings: Settings, **mocks):
     """
     Test the happy path of the ETL orchestrator, ensuring all main components
     and ancillary data processing steps are called.
     """
+    mock_process_docs = mocks["_process_documents"]
+    mock_process_links = mocks["_process_substance_links"]
+    mock_process_substances = mocks["_process_substances"]
+    mock_process_orgs = mocks["_process_organizations"]
+    mock_transform = mocks["transform_and_validate"]
+    mock_extract = mocks["extract_data"]
+    mock_get_adapter = mocks["get_db_adapter"]
+    mock_spor_client_class = mocks["SporApiClient"]
+    mock_storage_factory = mocks["StorageFactory"]
+
     # Arrange
-    settings = Settings()
     settings.etl.batch_size = 1 # Process one record at a time
     mock_adapter = MagicMock()
     mock_adapter.get_latest_high_water_mark.return_value = None
@@ -53,13 +55,16 @@ def test_run_etl_successful_flow(
     ])
     mock_extract.return_value = mock_raw_records_iterator
 
-    record1 = MagicMock(spec=EparIndex)
-    record1.last_update_date_source = datetime.date(2024, 1, 1)
-    record1.source_url = "http://example.com/doc1"
-    record2 = MagicMock(spec=EparIndex)
-    record2.last_update_date_source = datetime.date(2024, 1, 2)
-    record2.source_url = None
-    substance_links = [MagicMock(spec=EparSubstanceLink)]
+    # Plain stand-ins for EparIndex records: the orchestrator only reads these
+    # two attributes, and the bulk load that would dump them is mocked out.
+    record1 = SimpleNamespace(
+        last_update_date_source=datetime.date(2024, 1, 1),
+        source_url="http://example.com/doc1",
+    )
+    record2 = SimpleNamespace(
+        last_update_date_source=datetime.date(2024, 1, 2), source_url=None
+    )
+    substance_links = [object()]
 
     # Mock transform to return the new 4-tuple format
     mock_transform.return_value = iter([
@@ -74,15 +79,15 @@ def test_run_etl_successful_flow(
     # Assert
     mock_storage_factory.assert_called_once_with(settings.storage)
     mock_spor_client_class.assert_called_once_with(settings.spor_api)
+    mock_spor_client_instance.preconnect.assert_called_once_with()
+    mock_spor_client_instance.close.assert_called_once()
     mock_get_adapter.assert_called_once_with(settings)
     mock_adapter.connect.assert_called_once()
     mock_extract.assert_called_once()
     mock_transform.assert_called_once()
     call_args, _ = mock_transform.call_args
-    assert call_args[0] == [
-        {"product_number": "EMA/1", "id": 1},
-        {"product_number": "EMA/2", "id": 2},
-    ]
+    # The extracted records are streamed into the transform stage as they are.
+    assert call_args[0] is mock_raw_records_iterator
     assert call_args[1] == mock_spor_client_instance
     assert call_args[2] == 123
     # Check that all processing functions were called with the correct data
@@ -96,6 +101,8 @@ def test_run_etl_successful_flow(
         adapter=mock_adapter,
         processed_records=[record1],  # record2 has a None URL
         storage=mock_storage_instance,
+        max_workers=settings.etl.download_concurrency,
+        document_cache=None,
     )
     mock_adapter.close.assert_called_once()
 
@@ -105,13 +112,17 @@ def test_run_etl_successful_flow(
 @patch("py_load_epar.etl.orchestrator.get_db_adapter")
 @patch("py_load_epar.etl.orchestrator.extract_data")
 def test_run_etl_rolls_back_on_failure(
-    mock_extract, mock_get_adapter, mock_spor_client_class, mock_storage_factory
+    mock_extract,
+    mock_get_adapter,
+    mock_spor_client_class,
+    mock_storage_factory,
+    base_settings: Settings,
 ):
     """
     Test that the orchestrator calls rollback() on the adapter when an error occurs.
     """
     # Arrange
-    settings = Settings()
+    settings = base_settings
     mock_adapter = MagicMock()
     mock_get_adapter.return_value = mock_adapter
 
@@ -131,3 +142,27 @@ def test_run_etl_rolls_back_on_failure(
     mock_adapter.rollback.assert_called_once()
     assert not mock_adapter.finalize.called
     mock_adapter.close.assert_called_once()
+
+
+@patch("py_load_epar.etl.orchestrator.StorageFactory")
+@patch("py_load_epar.etl.orchestrator.SporApiClient")
+@patch("py_load_epar.etl.orchestrator.get_db_adapter")
+def test_run_etl_closes_spor_client_when_setup_fails(
+    mock_get_adapter,
+    mock_spor_client_class,
+    mock_storage_factory,
+    base_settings: Settings,
+):
+    """
+    Test that the SPOR client built by the orchestrator is closed even when
+    setting up storage fails before the load starts.
+    """
+    mock_storage_factory.return_value.get_storage.side_effect = ValueError(
+        "Unsupported storage backend"
+    )
+
+    with pytest.raises(ValueError, match="Unsupported storage backend"):
+        run_etl(base_settings)
+
+    mock_spor_client_class.return_value.close.assert_called_once_with()
+    mock_get_adapter.return_value.close.assert_called_once()
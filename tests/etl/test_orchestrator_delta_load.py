@@ -1,6 +1,6 @@
-import pandas as pd
+from typing import Any, Dict, List
+
 import pytest
-from pathlib import Path
 
 from py_load_epar.config import Settings
 from py_load_epar.db.postgres import PostgresAdapter
@@ -9,10 +9,9 @@ from py_load_epar.etl.orchestrator import run_etl
 # Mark all tests in this module as integration tests
 pytestmark = pytest.mark.integration
 
-@pytest.fixture
-def initial_excel_file(tmp_path: Path) -> Path:
-    """Creates the initial EMA data file for the FULL load."""
-    file_path = tmp_path / "initial_ema_data.xlsx"
+@pytest.fixture(scope="session")
+def initial_records(ema_records) -> List[Dict[str, Any]]:
+    """Builds the parsed records of the initial EMA data for the FULL load."""
     data = {
         "Category": ["Human", "Human"],
         "Medicine name": ["TestMed A", "TestMed B"],
@@ -32,14 +31,11 @@ def initial_excel_file(tmp_path: Path) -> Path:
         "Marketing authorisation holder/company name": ["PharmaCo", "BioGen"],
         "URL": ["http://example.com/1", "http://example.com/2"],
     }
-    df = pd.DataFrame(data)
-    df.to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
-
-@pytest.fixture
-def delta_excel_file(tmp_path: Path) -> Path:
-    """Creates the delta EMA data file for the DELTA load."""
-    file_path = tmp_path / "delta_ema_data.xlsx"
+    return ema_records(data)
+
+@pytest.fixture(scope="session")
+def delta_records(ema_records) -> List[Dict[str, Any]]:
+    """Builds the parsed records of the delta EMA data for the DELTA load."""
     data = {
         "Category": ["Human", "Human", "Human"],
         "Medicine name": ["TestMed B Updated", "TestMed C", "TestMed A"], # TestMed A is withdrawn
@@ -59,16 +55,15 @@ def delta_excel_file(tmp_path: Path) -> Path:
         "Marketing authorisation holder/company name": ["BioGen Inc.", "NeuroCorp", "PharmaCo"],
         "URL": ["http://example.com/2/updated", "http://example.com/3", "http://example.com/1"],
     }
-    df = pd.DataFrame(data)
-    df.to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
+    return ema_records(data)
 
 def test_delta_load_strategy(
     postgres_adapter: PostgresAdapter,
     db_settings: Settings,
     mocker,
-    initial_excel_file: Path,
-    delta_excel_file: Path,
+    patch_ema_source,
+    initial_records: List[Dict[str, Any]],
+    delta_records: List[Dict[str, Any]],
 ):
     """
     Tests the DELTA load strategy.
@@ -81,55 +76,66 @@ def test_delta_load_strategy(
     mock_spor_client.return_value.search_organisation.return_value = None
     mock_spor_client.return_value.search_substance.return_value = None
     mocker.patch("py_load_epar.etl.orchestrator._process_documents", return_value=0)
-    mock_download = mocker.patch("py_load_epar.etl.extract.download_file_to_memory")
 
     # --- 1. Run FULL load ---
-    mock_download.return_value = initial_excel_file.open("rb")
+    patch_ema_source(initial_records)
     settings = db_settings
     settings.etl.load_strategy = "FULL"
     run_etl(settings)
 
     # --- Assert initial state ---
     with postgres_adapter.conn.cursor() as cursor:
-        cursor.execute("SELECT COUNT(*) FROM epar_index")
-        assert cursor.fetchone()[0] == 2
-        cursor.execute("SELECT medicine_name FROM epar_index WHERE epar_id = 'EMA/2'")
-        assert cursor.fetchone()[0] == "TestMed B"
-        cursor.execute("SELECT is_active FROM epar_index WHERE epar_id = 'EMA/1'")
-        assert cursor.fetchone()[0] is True
+        cursor.execute(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM epar_index),
+                (SELECT medicine_name FROM epar_index WHERE epar_id = 'EMA/2'),
+                (SELECT is_active FROM epar_index WHERE epar_id = 'EMA/1')
+            """
+        )
+        assert cursor.fetchone() == (2, "TestMed B", True)
 
     # --- 2. Run DELTA load ---
-    mock_download.return_value = delta_excel_file.open("rb")
+    patch_ema_source(delta_records)
     settings.etl.load_strategy = "DELTA"
     run_etl(settings)
 
     # --- 3. Assert final state ---
+    # Fetch every value under test in a single round trip.
     with postgres_adapter.conn.cursor() as cursor:
-        # Verify total count (1 new record)
-        cursor.execute("SELECT COUNT(*) FROM epar_index")
-        assert cursor.fetchone()[0] == 3
+        cursor.execute(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM epar_index),
+                (SELECT medicine_name FROM epar_index WHERE epar_id = 'EMA/2'),
+                (SELECT source_url FROM epar_index WHERE epar_id = 'EMA/2'),
+                (SELECT medicine_name FROM epar_index WHERE epar_id = 'EMA/3'),
+                (SELECT is_active FROM epar_index WHERE epar_id = 'EMA/1')
+            """
+        )
+        count, name_2, url_2, name_3, active_1 = cursor.fetchone()
+
+    # Verify total count (1 new record)
+    assert count == 3
 
-        # Verify updated record (EMA/2)
-        cursor.execute("SELECT medicine_name, source_url FROM epar_index WHERE epar_id = 'EMA/2'")
-        updated_record = cursor.fetchone()
-        assert updated_record[0] == "TestMed B Updated"
-        assert updated_record[1] == "http://example.com/2/updated"
+    # Verify updated record (EMA/2)
+    assert name_2 == "TestMed B Updated"
+    assert url_2 == "http://example.com/2/updated"
 
-        # Verify new record (EMA/3)
-        cursor.execute("SELECT medicine_name FROM epar_index WHERE epar_id = 'EMA/3'")
-        assert cursor.fetchone()[0] == "TestMed C"
+    # Verify new record (EMA/3)
+    assert name_3 == "TestMed C"
 
-        # Verify withdrawn record (EMA/1)
-        cursor.execute("SELECT is_active FROM epar_index WHERE epar_id = 'EMA/1'")
-        assert cursor.fetchone()[0] is False
+    # Verify withdrawn record (EMA/1)
+    assert active_1 is False
 
 
 def test_delta_load_idempotency(
     postgres_adapter: PostgresAdapter,
     db_settings: Settings,
     mocker,
-    initial_excel_file: Path,
-    delta_excel_file: Path,
+    patch_ema_source,
+    initial_records: List[Dict[str, Any]],
+    delta_records: List[Dict[str, Any]],
 ):
     """
     Tests that running a DELTA load twice with the same data results in the
@@ -140,16 +146,15 @@ def test_delta_load_idempotency(
     mock_spor_client.return_value.search_organisation.return_value = None
     mock_spor_client.return_value.search_substance.return_value = None
     mocker.patch("py_load_epar.etl.orchestrator._process_documents", return_value=0)
-    mock_download = mocker.patch("py_load_epar.etl.extract.download_file_to_memory")
 
     # --- 1. Run FULL load ---
-    mock_download.return_value = initial_excel_file.open("rb")
+    patch_ema_source(initial_records)
     settings = db_settings
     settings.etl.load_strategy = "FULL"
     run_etl(settings)
 
     # --- 2. Run DELTA load the first time ---
-    mock_download.return_value = delta_excel_file.open("rb")
+    patch_ema_source(delta_records)
     settings.etl.load_strategy = "DELTA"
     run_etl(settings)
 
@@ -167,7 +172,7 @@ def test_delta_load_idempotency(
     assert len(first_run_data) == 3  # Ensure the delta load actually ran
 
     # --- 4. Run DELTA load the second time ---
-    # The download mock will continue to return the delta file
+    # The source mock will continue to return the delta records
     # Clear the pipeline execution log to simulate a fresh run
     with postgres_adapter.conn.cursor() as cursor:
         cursor.execute("TRUNCATE TABLE pipeline_execution RESTART IDENTITY CASCADE")
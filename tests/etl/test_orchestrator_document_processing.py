@@ -3,6 +3,7 @@ from unittest.mock import MagicMock, call
 
 import pytest
 import requests_mock
+from py_load_epar.etl.document_cache import DocumentCache
 from py_load_epar.etl.orchestrator import _process_documents
 from py_load_epar.models import EparIndex
 
@@ -220,3 +221,230 @@ def test_process_documents_handles_multiple_documents(
         any_order=True,
     )
     mock_db_adapter.bulk_load_batch.assert_called_once()
+
+
+def test_process_documents_reuses_cached_documents(
+    requests_mock, mock_db_adapter, mock_storage, mocker, tmp_path
+):
+    """
+    Tests that documents recorded in the document cache by an earlier run are
+    not downloaded again, and that their stored URI and hash are reused.
+    """
+    # Arrange
+    mock_db_adapter.bulk_load_batch.return_value = 2
+    download_mock = mocker.patch(
+        "py_load_epar.etl.orchestrator.download_document_and_hash",
+        return_value=("mock://storage/doc.pdf", "mock_hash"),
+    )
+
+    epar_record = EparIndex(
+        epar_id="5",
+        source_url="http://example.com/cached_docs",
+        medicine_name="TestMed 5",
+        authorization_status="Authorised",
+        therapeutic_area="Test Area",
+        last_update_date_source="2024-01-01",
+        etl_execution_id=123,
+    )
+
+    html_content = """
+    <html><body>
+        <a href="doc1.pdf">Public Assessment Report</a>
+        <a href="doc2.pdf">Package Leaflet</a>
+    </body></html>
+    """
+    requests_mock.get("http://example.com/cached_docs", text=html_content)
+    cache_path = tmp_path / "documents.sqlite"
+
+    # Act: run twice, each time with a fresh cache on the same file
+    for _ in range(2):
+        with DocumentCache(cache_path, "mock://storage") as document_cache:
+            count = _process_documents(
+                adapter=mock_db_adapter,
+                processed_records=[epar_record],
+                storage=mock_storage,
+                document_cache=document_cache,
+            )
+
+    # Assert: only the first run downloaded the documents
+    assert count == 2
+    assert download_mock.call_count == 2
+    loaded_docs = list(mock_db_adapter.bulk_load_batch.call_args.args[0])
+    columns = mock_db_adapter.bulk_load_batch.call_args.args[2]
+    assert {
+        (doc["source_url"], doc["storage_location"], doc["file_hash"])
+        for doc in (dict(zip(columns, row)) for row in loaded_docs)
+    } == {
+        ("http://example.com/doc1.pdf", "mock://storage/doc.pdf", "mock_hash"),
+        ("http://example.com/doc2.pdf", "mock://storage/doc.pdf", "mock_hash"),
+    }
+
+
+@pytest.mark.parametrize(
+    "revision, storage_target",
+    [
+        # EMA republished the documents at the same URLs
+        ("2024-02-01", "mock://storage"),
+        # The documents are now stored somewhere else
+        ("2024-01-01", "mock://other-storage"),
+    ],
+)
+def test_process_documents_downloads_again_for_new_revision_or_storage(
+    requests_mock,
+    mock_db_adapter,
+    mock_storage,
+    mocker,
+    tmp_path,
+    revision,
+    storage_target,
+):
+    """
+    Tests that cached documents are only reused for the same record revision
+    and storage target.
+    """
+    mock_db_adapter.bulk_load_batch.return_value = 1
+    download_mock = mocker.patch(
+        "py_load_epar.etl.orchestrator.download_document_and_hash",
+        return_value=("mock://storage/doc.pdf", "mock_hash"),
+    )
+    requests_mock.get(
+        "http://example.com/revised_docs",
+        text='<a href="doc.pdf">Public Assessment Report</a>',
+    )
+    cache_path = tmp_path / "documents.sqlite"
+
+    runs = [("2024-01-01", "mock://storage"), (revision, storage_target)]
+    for last_update, target in runs:
+        epar_record = EparIndex(
+            epar_id="6",
+            source_url="http://example.com/revised_docs",
+            medicine_name="TestMed 6",
+            authorization_status="Authorised",
+            therapeutic_area="Test Area",
+            last_update_date_source=last_update,
+            etl_execution_id=123,
+        )
+        with DocumentCache(cache_path, target) as document_cache:
+            _process_documents(
+                adapter=mock_db_adapter,
+                processed_records=[epar_record],
+                storage=mock_storage,
+                document_cache=document_cache,
+            )
+
+    assert download_mock.call_count == 2
+
+
+def test_process_documents_loads_all_records_in_one_batch(
+    requests_mock, mock_db_adapter, mock_storage, mocker
+):
+    """
+    Tests that the documents of several EPAR records are loaded with a single
+    bulk load rather than one per record.
+    """
+    # Arrange
+    mock_db_adapter.bulk_load_batch.return_value = 3
+    mocker.patch(
+        "py_load_epar.etl.orchestrator.download_document_and_hash",
+        return_value=("mock://storage/doc.pdf", "mock_hash"),
+    )
+
+    records = [
+        EparIndex(
+            epar_id=epar_id,
+            source_url=f"http://example.com/epar_{epar_id}",
+            medicine_name=f"TestMed {epar_id}",
+            authorization_status="Authorised",
+            therapeutic_area="Test Area",
+            last_update_date_source="2024-01-01",
+            etl_execution_id=123,
+        )
+        for epar_id in ("6", "7")
+    ]
+    requests_mock.get(
+        "http://example.com/epar_6",
+        text='<a href="doc6.pdf">EPAR</a><a href="leaflet6.pdf">Package Leaflet</a>',
+    )
+    requests_mock.get("http://example.com/epar_7", text='<a href="doc7.pdf">EPAR</a>')
+
+    # Act
+    count = _process_documents(
+        adapter=mock_db_adapter,
+        processed_records=records,
+        storage=mock_storage,
+    )
+
+    # Assert
+    assert count == 3
+    mock_db_adapter.prepare_load.assert_called_once_with("DELTA", "epar_documents")
+    mock_db_adapter.bulk_load_batch.assert_called_once()
+    loaded_docs = list(mock_db_adapter.bulk_load_batch.call_args.args[0])
+    columns = mock_db_adapter.bulk_load_batch.call_args.args[2]
+    assert sorted(dict(zip(columns, row))["epar_id"] for row in loaded_docs) == [
+        "6",
+        "6",
+        "7",
+    ]
+
+
+def test_process_documents_interleaves_downloads_with_page_fetches(
+    requests_mock, mock_db_adapter, mock_storage, mocker
+):
+    """
+    Tests that only a window of page fetches is queued ahead, so a page's
+    documents are downloaded before the remaining pages have all been fetched.
+    """
+    # Arrange
+    mock_db_adapter.bulk_load_batch.return_value = 3
+    requests_seen = []
+
+    def _record_page_request(request):
+        requests_seen.append(request.url)
+        return True
+
+    def _download(url, storage):
+        requests_seen.append(url)
+        return "mock://storage/doc.pdf", "mock_hash"
+
+    mocker.patch(
+        "py_load_epar.etl.orchestrator.download_document_and_hash",
+        side_effect=_download,
+    )
+
+    records = [
+        EparIndex(
+            epar_id=epar_id,
+            source_url=f"http://example.com/epar_{epar_id}",
+            medicine_name=f"TestMed {epar_id}",
+            authorization_status="Authorised",
+            therapeutic_area="Test Area",
+            last_update_date_source="2024-01-01",
+            etl_execution_id=123,
+        )
+        for epar_id in ("1", "2", "3")
+    ]
+    for epar_id in ("1", "2", "3"):
+        requests_mock.get(
+            f"http://example.com/epar_{epar_id}",
+            text=f'<a href="doc{epar_id}.pdf">EPAR</a>',
+            additional_matcher=_record_page_request,
+        )
+
+    # Act
+    count = _process_documents(
+        adapter=mock_db_adapter,
+        processed_records=records,
+        storage=mock_storage,
+        max_workers=1,
+    )
+
+    # Assert
+    assert count == 3
+    assert requests_seen == [
+        "http://example.com/epar_1",
+        "http://example.com/doc1.pdf",
+        "http://example.com/epar_2",
+        "http://example.com/doc2.pdf",
+        "http://example.com/epar_3",
+        "http://example.com/doc3.pdf",
+    ]
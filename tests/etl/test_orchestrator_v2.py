@@ -18,8 +18,8 @@ def test_process_documents_parses_html_and_downloads(mocker):
     mock_adapter.bulk_load_batch.return_value = 1
     mock_storage = MagicMock(spec=IStorage)
 
-    # Mock the response from requests.get
-    mock_response = mocker.patch("requests.get")
+    # Mock the response from the shared session's get
+    mock_response = mocker.patch("requests.Session.get")
     mock_response.return_value.status_code = 200
     mock_response.return_value.raise_for_status.return_value = None
 
@@ -109,7 +109,7 @@ def test_fetch_html_with_retry_succeeds_after_failures(mocker):
     and eventually succeeds.
     """
     # Arrange
-    mock_get = mocker.patch("requests.get")
+    mock_get = mocker.patch("requests.Session.get")
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.content = b"Success"
@@ -139,7 +139,7 @@ def test_fetch_html_with_retry_fails_after_all_attempts(mocker):
     exhausting all retry attempts.
     """
     # Arrange
-    mock_get = mocker.patch("requests.get")
+    mock_get = mocker.patch("requests.Session.get")
     mock_get.side_effect = requests.exceptions.RequestException("Persistent error")
 
     # Act & Assert
@@ -1,15 +1,14 @@
 from pathlib import Path
 
+import openpyxl
 import pytest
 
 from py_load_epar.etl.parser import parse_ema_excel_file
 
-import pandas as pd
-
 # (Kept the original test for non-existent file)
 
 @pytest.fixture
-def valid_excel_file(tmp_path: Path) -> Path:
+def valid_excel_file(tmp_path: Path, write_ema_xlsx) -> Path:
     """Creates a valid Excel file for parser testing with canonical headers."""
     file_path = tmp_path / "parser_test_data.xlsx"
     data = {
@@ -25,9 +24,7 @@ def valid_excel_file(tmp_path: Path) -> Path:
         "Marketing authorisation holder/company name": ["Test Pharma 1", "Test Pharma 2"],
         "Revision date": ["2023-01-15", "2023-01-16"],
     }
-    df = pd.DataFrame(data)
-    df.to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
+    return write_ema_xlsx(file_path, data)
 
 
 def test_parse_ema_excel_file_returns_iterator(valid_excel_file: Path):
@@ -64,9 +61,52 @@ def test_parse_ema_excel_file_yields_correct_data(valid_excel_file: Path):
 def test_parse_non_existent_file_raises_error():
     """
     Tests that the parser raises an exception when the file does not exist.
-    We expect openpyxl to raise a FileNotFoundError.
+    Both engines raise a FileNotFoundError.
     """
     non_existent_path = Path("this_file_does_not_exist.xlsx")
     with pytest.raises(FileNotFoundError):
         # We must consume the iterator to trigger the file open operation
         list(parse_ema_excel_file(non_existent_path))
+
+
+def test_calamine_engine_matches_openpyxl(valid_excel_file: Path, monkeypatch):
+    """
+    Tests that the optional calamine engine yields exactly the same records as
+    the openpyxl fallback.
+    """
+    pytest.importorskip("python_calamine")
+    from py_load_epar.etl import parser
+
+    calamine_records = list(parse_ema_excel_file(valid_excel_file))
+    monkeypatch.setattr(parser, "_HAS_CALAMINE", False)
+    openpyxl_records = list(parse_ema_excel_file(valid_excel_file))
+
+    assert calamine_records == openpyxl_records
+
+
+@pytest.mark.parametrize("has_calamine", [True, False])
+def test_parser_reads_first_worksheet_whatever_the_active_one(
+    tmp_path: Path, monkeypatch, has_calamine
+):
+    """
+    Tests that both engines read the first worksheet, even when the workbook
+    was saved with another sheet active.
+    """
+    if has_calamine:
+        pytest.importorskip("python_calamine")
+    from py_load_epar.etl import parser
+
+    monkeypatch.setattr(parser, "_HAS_CALAMINE", has_calamine)
+    workbook = openpyxl.Workbook()
+    first = workbook.active
+    first.append(["Medicine name", "Product number", "authorization_status", "URL"])
+    first.append(["First Med", "EMA/1", "Authorised", "http://example.com/1"])
+    notes = workbook.create_sheet("Notes")
+    notes.append(["Not the data"])
+    workbook.active = notes
+    file_path = tmp_path / "two_sheets.xlsx"
+    workbook.save(file_path)
+
+    records = list(parse_ema_excel_file(file_path))
+
+    assert [record["product_number"] for record in records] == ["EMA/1"]
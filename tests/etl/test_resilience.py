@@ -1,4 +1,3 @@
-import pandas as pd
 import pytest
 from pathlib import Path
 
@@ -11,7 +10,7 @@ pytestmark = pytest.mark.integration
 
 
 @pytest.fixture
-def file_with_missing_column(tmp_path: Path) -> Path:
+def file_with_missing_column(tmp_path: Path, write_ema_xlsx) -> Path:
     """Creates a sample EMA data file that is missing a critical column."""
     file_path = tmp_path / "missing_column_data.xlsx"
     data = {
@@ -23,9 +22,7 @@ def file_with_missing_column(tmp_path: Path) -> Path:
         "authorization_status": ["Authorised"],
         "URL": ["http://example.com/1"],
     }
-    df = pd.DataFrame(data)
-    df.to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
+    return write_ema_xlsx(file_path, data)
 
 
 def test_etl_fails_on_missing_critical_column(
@@ -54,7 +51,7 @@ def test_etl_fails_on_missing_critical_column(
 
 
 @pytest.fixture
-def file_with_bad_data_types(tmp_path: Path) -> Path:
+def file_with_bad_data_types(tmp_path: Path, write_ema_xlsx) -> Path:
     """Creates a sample EMA data file with incorrect data types."""
     file_path = tmp_path / "bad_data_type.xlsx"
     data = {
@@ -68,9 +65,7 @@ def file_with_bad_data_types(tmp_path: Path) -> Path:
         "Revision date": ["2023-01-01"],
         "URL": ["http://example.com/bad_date"],
     }
-    df = pd.DataFrame(data)
-    df.to_excel(file_path, index=False, sheet_name="Medicines for human use")
-    return file_path
+    return write_ema_xlsx(file_path, data)
 
 
 def test_etl_fails_on_bad_data_type(
@@ -2,6 +2,8 @@ import logging
 from typing import Any, Dict, List
 from unittest.mock import MagicMock
 
+import requests
+
 from py_load_epar.etl.transform import transform_and_validate
 from py_load_epar.models import EparIndex
 from py_load_epar.spor_api.client import SporApiClient
@@ -187,3 +189,73 @@ def test_transform_handles_complex_substances():
     mock_spor_client.search_substance.assert_any_call("SubstanceB")
     mock_spor_client.search_substance.assert_any_call("SubstanceC")
     mock_spor_client.search_substance.assert_any_call("SubstanceD")
+
+
+def test_transform_prefetches_spor_lookups_per_window(monkeypatch):
+    """
+    Test that the SPOR names of each window of records are searched in one
+    batch before the records are transformed.
+    """
+    monkeypatch.setattr("py_load_epar.etl.transform.SPOR_LOOKUP_WINDOW", 2)
+    raw_records: List[Dict[str, Any]] = [
+        {
+            "product_number": f"PROD-{i}",
+            "medicine_name": f"WindowMed {i}",
+            "marketing_authorization_holder_raw": f"Pharma {i}",
+            "active_substance_raw": f"Substance{i} and Shared",
+            "authorization_status": "Authorised",
+            "last_update_date_source": "2023-01-01",
+            "therapeutic_area": "Testing",
+        }
+        for i in range(3)
+    ]
+    mock_spor_client = MagicMock(spec=SporApiClient)
+    mock_spor_client.search_organisation.return_value = None
+    mock_spor_client.search_substance.return_value = None
+
+    results = list(transform_and_validate(iter(raw_records), mock_spor_client, 1))
+
+    organisation_batches = [
+        c.args[0] for c in mock_spor_client.search_organisations.call_args_list
+    ]
+    substance_batches = [
+        c.args[0] for c in mock_spor_client.search_substances.call_args_list
+    ]
+    assert len(results) == 3
+    assert organisation_batches == [["Pharma 0", "Pharma 1"], ["Pharma 2"]]
+    assert substance_batches == [
+        ["Substance0", "Shared", "Substance1", "Shared"],
+        ["Substance2", "Shared"],
+    ]
+
+
+def test_transform_skips_spor_lookups_when_prefetch_fails(caplog):
+    """
+    Test that when the SPOR API cannot be reached for a window, its records are
+    loaded without enrichment instead of being looked up one by one.
+    """
+    raw_records: List[Dict[str, Any]] = [
+        {
+            "product_number": "PROD-1",
+            "medicine_name": "OfflineMed",
+            "marketing_authorization_holder_raw": "Pharma 1",
+            "active_substance_raw": "Substance1",
+            "authorization_status": "Authorised",
+            "last_update_date_source": "2023-01-01",
+            "therapeutic_area": "Testing",
+        }
+    ]
+    mock_spor_client = MagicMock(spec=SporApiClient)
+    mock_spor_client.search_organisations.side_effect = (
+        requests.exceptions.ConnectionError("SPOR is down")
+    )
+
+    with caplog.at_level(logging.WARNING):
+        results = list(transform_and_validate(iter(raw_records), mock_spor_client, 1))
+
+    assert [(r[0].epar_id, r[0].mah_oms_id, r[1]) for r in results] == [
+        ("PROD-1", None, [])
+    ]
+    mock_spor_client.search_organisation.assert_not_called()
+    mock_spor_client.search_substance.assert_not_called()
+    assert "SPOR API unavailable" in caplog.text
@@ -1,13 +1,20 @@
+import base64
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
+import requests
 import requests_mock
+from pydantic import ValidationError
+from tenacity import wait_none
 
 from py_load_epar.config import SporApiSettings
-from py_load_epar.spor_api.client import SporApiClient
+from py_load_epar.spor_api.client import CacheInfo, SporApiClient, _NoMatch
 from py_load_epar.spor_api.models import SporOmsOrganisation, SporSmsSubstance
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def spor_settings() -> SporApiSettings:
     """Provides a sample SporApiSettings object for tests."""
     return SporApiSettings(
@@ -18,11 +25,27 @@ def spor_settings() -> SporApiSettings:
     )
 
 
-def test_authenticate_success(spor_settings):
+@pytest.fixture(scope="module")
+def shared_client(spor_settings: SporApiSettings) -> SporApiClient:
+    """Builds one SporApiClient, with its pooled session, for the whole module."""
+    with SporApiClient(spor_settings) as client:
+        yield client
+
+
+@pytest.fixture
+def client(shared_client: SporApiClient) -> SporApiClient:
+    """
+    Provides the module's SporApiClient, returned to a fresh state after the
+    test: no cached lookups and no authentication token.
+    """
+    yield shared_client
+    shared_client.reset()
+
+
+def test_authenticate_success(client, spor_settings):
     """
     Test that the client successfully authenticates and stores the token.
     """
-    client = SporApiClient(spor_settings)
     with requests_mock.Mocker() as m:
         m.post(
             f"{spor_settings.base_url}/api/Account",
@@ -35,11 +58,74 @@ def test_authenticate_success(spor_settings):
         )
 
 
-def test_authenticate_is_cached(spor_settings):
+def test_reset_forgets_token_and_cached_lookups(spor_settings):
     """
-    Test that the client authenticates only once and caches the token.
+    Test that reset() drops the token and cached lookups, so the next search
+    authenticates and queries the API again.
     """
     client = SporApiClient(spor_settings)
+
+    with requests_mock.Mocker() as m:
+        mock_auth = m.post(
+            f"{spor_settings.base_url}/api/Account",
+            json={"result": {"accessToken": "fake-token"}},
+        )
+        mock_get = m.get(
+            f"{spor_settings.base_url}/api/v1/spor/oms/organisations",
+            json={"items": []},
+        )
+
+        client.search_organisation("Test Pharma")
+        client.reset()
+
+        assert "Authorization" not in client._session.headers
+        assert client.cache_info() == CacheInfo(
+            hits=0, misses=0, maxsize=spor_settings.cache_maxsize, currsize=0
+        )
+        client.search_organisation("Test Pharma")
+        assert mock_auth.call_count == 2
+        assert mock_get.call_count == 2
+
+
+def test_client_reuses_pooled_session_and_closes_it(spor_settings, mocker):
+    """
+    Test that every call goes through one pooled session, which is closed when
+    the client is used as a context manager.
+    """
+    with SporApiClient(spor_settings) as client:
+        session = client._session
+        close_spy = mocker.spy(session, "close")
+        for prefix in ("http://", "https://"):
+            adapter = session.get_adapter(f"{prefix}test.spor.api/")
+            assert adapter._pool_maxsize == 16
+            # Retrying is left to the client, so requests are not retried twice.
+            assert adapter.max_retries.total == 0
+
+    close_spy.assert_called_once_with()
+
+
+@pytest.mark.parametrize(
+    "response", [{"status_code": 404}, {"exc": requests.exceptions.ConnectTimeout}]
+)
+def test_preconnect_opens_connection_in_background(client, spor_settings, response):
+    """
+    Test that preconnecting sends a HEAD request to the API root on a daemon
+    thread, and that a failure there is swallowed.
+    """
+    with requests_mock.Mocker() as m:
+        mock_head = m.head(f"{spor_settings.base_url}/", **response)
+        thread = client.preconnect()
+        thread.join(timeout=5)
+
+    assert thread.daemon
+    assert not thread.is_alive()
+    assert mock_head.call_count == 1
+
+
+def test_authenticate_is_cached(client, spor_settings):
+    """
+    Test that the client authenticates only once and caches the token.
+    """
     with requests_mock.Mocker() as m:
         mock_post = m.post(
             f"{spor_settings.base_url}/api/Account",
@@ -52,11 +138,79 @@ def test_authenticate_is_cached(spor_settings):
         assert mock_post.call_count == 1
 
 
-def test_search_organisation_success(spor_settings):
+def _jwt(claims: dict) -> str:
+    """Builds an unsigned JWT carrying the given claims."""
+
+    def _encode(part: dict) -> str:
+        encoded = base64.urlsafe_b64encode(json.dumps(part).encode())
+        return encoded.rstrip(b"=").decode()
+
+    return f"{_encode({'alg': 'HS256', 'typ': 'JWT'})}.{_encode(claims)}.signature"
+
+
+def test_authenticate_renews_token_before_it_expires(client, spor_settings):
+    """
+    Test that the token's `exp` claim is honoured: a token well within its
+    lifetime is reused, while one about to expire is renewed.
+    """
+    now = time.time()
+    with requests_mock.Mocker() as m:
+        mock_post = m.post(
+            f"{spor_settings.base_url}/api/Account",
+            [
+                {"json": {"result": {"accessToken": _jwt({"exp": now + 30})}}},
+                {"json": {"result": {"accessToken": _jwt({"exp": now + 3600})}}},
+            ],
+        )
+        client._authenticate()
+        assert client._token_expires_at == pytest.approx(now + 30)
+
+        # Inside the refresh margin, so the token is renewed...
+        client._authenticate()
+        assert client._token_expires_at == pytest.approx(now + 3600)
+        # ...and then reused.
+        client._authenticate()
+
+        assert mock_post.call_count == 2
+
+    # An expired token is always renewed.
+    client._token_expires_at = 0
+    with requests_mock.Mocker() as m:
+        mock_post = m.post(
+            f"{spor_settings.base_url}/api/Account",
+            json={"result": {"accessToken": "opaque-token"}},
+        )
+        client._authenticate()
+        assert mock_post.call_count == 1
+        assert client._auth_token == "opaque-token"
+
+
+def test_concurrent_lookups_refresh_an_expiring_token_once(client, spor_settings):
+    """
+    Test that threads finding the token about to expire at the same time
+    authenticate only once between them.
+    """
+    client._auth_token = _jwt({"exp": time.time() + 30})
+    client._token_expires_at = time.time() + 30
+
+    def _slow_token(request, context):
+        time.sleep(0.05)
+        return {"result": {"accessToken": _jwt({"exp": time.time() + 3600})}}
+
+    with requests_mock.Mocker() as m:
+        mock_post = m.post(f"{spor_settings.base_url}/api/Account", json=_slow_token)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for future in [executor.submit(client._authenticate) for _ in range(8)]:
+                future.result()
+
+        assert mock_post.call_count == 1
+
+
+def test_search_organisation_success(client, spor_settings):
     """
     Test organisation search with a single, high-confidence result.
     """
-    client = SporApiClient(spor_settings)
     org_name = "Test Pharma"
     api_response = {
         "items": [{"orgId": "ORG-123", "name": org_name}]
@@ -71,15 +225,14 @@ def test_search_organisation_success(spor_settings):
         assert isinstance(result, SporOmsOrganisation)
         assert result.org_id == "ORG-123"
         # Check that the result is cached
-        assert org_name in client._org_cache
-        assert client._org_cache[org_name] is result
+        assert "test pharma" in client._org_cache
+        assert client._org_cache["test pharma"] is result
 
 
-def test_search_organisation_no_match(spor_settings):
+def test_search_organisation_no_match(client, spor_settings):
     """
     Test organisation search with zero results.
     """
-    client = SporApiClient(spor_settings)
     org_name = "Unknown Pharma"
     api_response = {"items": []}
 
@@ -90,14 +243,16 @@ def test_search_organisation_no_match(spor_settings):
         result = client.search_organisation(org_name)
 
         assert result is None
-        assert client._org_cache[org_name] is None
+        assert client._org_cache[org_name.casefold()] is None
+        assert isinstance(
+            client._cache_entries["organisation", org_name.casefold()], _NoMatch
+        )
 
 
-def test_search_organisation_ambiguous_match(spor_settings):
+def test_search_organisation_ambiguous_match(client, spor_settings):
     """
     Test organisation search with multiple results (low-confidence).
     """
-    client = SporApiClient(spor_settings)
     org_name = "Ambiguous Pharma"
     api_response = {
         "items": [
@@ -113,14 +268,16 @@ def test_search_organisation_ambiguous_match(spor_settings):
         result = client.search_organisation(org_name)
 
         assert result is None
-        assert client._org_cache[org_name] is None
+        assert client._org_cache[org_name.casefold()] is None
+        assert isinstance(
+            client._cache_entries["organisation", org_name.casefold()], _NoMatch
+        )
 
 
-def test_search_organisation_is_cached(spor_settings):
+def test_search_organisation_is_cached(client, spor_settings):
     """
     Test that organisation search results are cached.
     """
-    client = SporApiClient(spor_settings)
     org_name = "Test Pharma"
     api_response = {
         "items": [{"orgId": "ORG-123", "name": org_name}]
@@ -131,18 +288,148 @@ def test_search_organisation_is_cached(spor_settings):
         mock_get = m.get(f"{spor_settings.base_url}/api/v1/spor/oms/organisations", json=api_response)
 
         # Search for the same name twice
-        client.search_organisation(org_name)
-        client.search_organisation(org_name)
+        first = client.search_organisation(org_name)
+        second = client.search_organisation(org_name)
 
         # The mock GET should have been called only once
         assert mock_get.call_count == 1
 
+    # The cached model is shared between callers, so it must not be mutable.
+    assert second is first
+    with pytest.raises(ValidationError):
+        first.org_id = "ORG-999"
+
+
+@pytest.mark.parametrize(
+    "search_method, path",
+    [
+        ("search_organisation", "oms/organisations"),
+        ("search_substance", "sms/substances"),
+    ],
+)
+def test_search_cache_ignores_case_and_whitespace(
+    client, spor_settings, search_method, path
+):
+    """
+    Test that names differing only in case or whitespace share a cache entry,
+    while the API is queried with the name as given.
+    """
+
+    with requests_mock.Mocker() as m:
+        m.post(
+            f"{spor_settings.base_url}/api/Account",
+            json={"result": {"accessToken": "fake-token"}},
+        )
+        mock_get = m.get(
+            f"{spor_settings.base_url}/api/v1/spor/{path}", json={"items": []}
+        )
+
+        getattr(client, search_method)("Test  Pharma")
+        getattr(client, search_method)("test pharma ")
+
+        assert mock_get.call_count == 1
+        assert "name=Test++Pharma&" in mock_get.last_request.url
+
+
+def test_search_cache_evicts_least_recently_used_and_reports_stats(spor_settings):
+    """
+    Test that the lookup cache holds at most `cache_maxsize` names, evicting the
+    least recently used, and that cache_info counts hits and misses.
+    """
+    client = SporApiClient(spor_settings.model_copy(update={"cache_maxsize": 2}))
+
+    with requests_mock.Mocker() as m:
+        m.post(
+            f"{spor_settings.base_url}/api/Account",
+            json={"result": {"accessToken": "fake-token"}},
+        )
+        mock_get = m.get(
+            f"{spor_settings.base_url}/api/v1/spor/oms/organisations",
+            json={"items": []},
+        )
+
+        for name in ("A", "B", "A", "C", "A", "B"):
+            client.search_organisation(name)
+
+        # 'B' was evicted by 'C' and had to be looked up again.
+        looked_up = [r.qs["name"][0] for r in mock_get.request_history]
+        assert looked_up == ["a", "b", "c", "b"]
+        assert client.cache_info() == CacheInfo(
+            hits=2, misses=4, maxsize=2, currsize=2
+        )
+
+    client.cache_clear()
+    assert client.cache_info() == CacheInfo(hits=0, misses=0, maxsize=2, currsize=0)
+
 
-def test_search_organisation_retries_on_failure(spor_settings):
+def test_search_caches_share_one_bound(spor_settings):
+    """
+    Test that `cache_maxsize` bounds organisation and substance lookups, matches
+    and misses together.
+    """
+    client = SporApiClient(spor_settings.model_copy(update={"cache_maxsize": 2}))
+
+    def _respond(request, context):
+        name = request.qs["name"][0]
+        items = [{"orgId": "ORG-1", "name": name}] if name == "known" else []
+        return {"items": items}
+
+    with requests_mock.Mocker() as m:
+        m.post(
+            f"{spor_settings.base_url}/api/Account",
+            json={"result": {"accessToken": "fake-token"}},
+        )
+        m.get(f"{spor_settings.base_url}/api/v1/spor/oms/organisations", json=_respond)
+        mock_substances = m.get(
+            f"{spor_settings.base_url}/api/v1/spor/sms/substances", json={"items": []}
+        )
+
+        client.search_substance("Aspirin")
+        client.search_organisation("Known")
+        client.search_organisation("Unknown")
+        assert client.cache_info().currsize == 2
+
+        # The substance was the least recently used entry of the shared cache.
+        client.search_substance("Aspirin")
+        assert mock_substances.call_count == 2
+        assert client.cache_info() == CacheInfo(hits=0, misses=4, maxsize=2, currsize=2)
+
+
+def test_search_cache_expires_misses_but_keeps_matches(spor_settings):
+    """
+    Test that names without a match are looked up again once their negative
+    cache entry expires, while matches stay cached.
+    """
+    client = SporApiClient(spor_settings.model_copy(update={"negative_cache_ttl": 0}))
+
+    def _respond(request, context):
+        name = request.qs["name"][0]
+        items = [{"orgId": "ORG-1", "name": name}] if name == "known" else []
+        return {"items": items}
+
+    with requests_mock.Mocker() as m:
+        m.post(
+            f"{spor_settings.base_url}/api/Account",
+            json={"result": {"accessToken": "fake-token"}},
+        )
+        mock_get = m.get(
+            f"{spor_settings.base_url}/api/v1/spor/oms/organisations", json=_respond
+        )
+
+        for name in ("Known", "Unknown", "Known", "Unknown"):
+            client.search_organisation(name)
+
+        assert [r.qs["name"][0] for r in mock_get.request_history] == [
+            "known",
+            "unknown",
+            "unknown",
+        ]
+
+
+def test_search_organisation_retries_on_failure(client, spor_settings):
     """
     Test that the client retries the search request on transient server errors.
     """
-    client = SporApiClient(spor_settings)
     org_name = "Retry Pharma"
     success_response = {
         "items": [{"orgId": "ORG-RETRY", "name": org_name}]
@@ -173,11 +460,53 @@ def test_search_organisation_retries_on_failure(spor_settings):
         assert result.org_id == "ORG-RETRY"
 
 
-def test_authenticate_failure(spor_settings):
+@pytest.mark.parametrize(
+    "search_method, path, id_field, cache_attr",
+    [
+        ("search_organisations", "oms/organisations", "orgId", "_org_cache"),
+        ("search_substances", "sms/substances", "smsId", "_substance_cache"),
+    ],
+)
+def test_batched_search_looks_up_each_new_name_once(
+    client, spor_settings, search_method, path, id_field, cache_attr
+):
+    """
+    Test that a batched search returns a result for every distinct name and
+    only sends requests for names that are not cached yet.
+    """
+    getattr(client, cache_attr)["cached"] = None
+
+    def _respond(request, context):
+        name = request.qs["name"][0]
+        return {"items": [{id_field: f"ID-{name}", "name": name}]}
+
+    with requests_mock.Mocker() as m:
+        mock_post = m.post(
+            f"{spor_settings.base_url}/api/Account",
+            json={"result": {"accessToken": "fake-token"}},
+        )
+        mock_get = m.get(f"{spor_settings.base_url}/api/v1/spor/{path}", json=_respond)
+
+        results = getattr(client, search_method)(
+            ["alpha", "beta", "alpha", " Alpha", "Cached"]
+        )
+
+    assert list(results) == ["alpha", "beta", " Alpha", "Cached"]
+    assert results[" Alpha"] is results["alpha"]
+    assert results["Cached"] is None
+    assert results["alpha"].name == "alpha"
+    assert results["beta"].name == "beta"
+    assert mock_post.call_count == 1
+    assert sorted(r.qs["name"][0] for r in mock_get.request_history) == [
+        "alpha",
+        "beta",
+    ]
+
+
+def test_authenticate_failure(client, spor_settings):
     """
     Test that authentication raises an exception on API error.
     """
-    client = SporApiClient(spor_settings)
     with requests_mock.Mocker() as m:
         m.post(
             f"{spor_settings.base_url}/api/Account",
@@ -188,11 +517,10 @@ def test_authenticate_failure(spor_settings):
             client._authenticate()
 
 
-def test_search_substance_success(spor_settings):
+def test_search_substance_success(client, spor_settings):
     """
     Test substance search with a single, high-confidence result.
     """
-    client = SporApiClient(spor_settings)
     substance_name = "Test-substance"
     api_response = {
         "items": [{"smsId": "SUB-123", "name": substance_name}]
@@ -206,15 +534,14 @@ def test_search_substance_success(spor_settings):
 
         assert isinstance(result, SporSmsSubstance)
         assert result.sms_id == "SUB-123"
-        assert substance_name in client._substance_cache
-        assert client._substance_cache[substance_name] is result
+        assert "test-substance" in client._substance_cache
+        assert client._substance_cache["test-substance"] is result
 
 
-def test_search_substance_no_match(spor_settings):
+def test_search_substance_no_match(client, spor_settings):
     """
     Test substance search with zero results.
     """
-    client = SporApiClient(spor_settings)
     substance_name = "Unknown Substance"
     api_response = {"items": []}
 
@@ -225,14 +552,16 @@ def test_search_substance_no_match(spor_settings):
         result = client.search_substance(substance_name)
 
         assert result is None
-        assert client._substance_cache[substance_name] is None
+        assert client._substance_cache[substance_name.casefold()] is None
+        assert isinstance(
+            client._cache_entries["substance", substance_name.casefold()], _NoMatch
+        )
 
 
-def test_search_substance_ambiguous_match(spor_settings):
+def test_search_substance_ambiguous_match(client, spor_settings):
     """
     Test substance search with multiple results (low-confidence).
     """
-    client = SporApiClient(spor_settings)
     substance_name = "Ambiguous Substance"
     api_response = {
         "items": [
@@ -248,14 +577,16 @@ def test_search_substance_ambiguous_match(spor_settings):
         result = client.search_substance(substance_name)
 
         assert result is None
-        assert client._substance_cache[substance_name] is None
+        assert client._substance_cache[substance_name.casefold()] is None
+        assert isinstance(
+            client._cache_entries["substance", substance_name.casefold()], _NoMatch
+        )
 
 
-def test_search_substance_is_cached(spor_settings):
+def test_search_substance_is_cached(client, spor_settings):
     """
     Test that substance search results are cached.
     """
-    client = SporApiClient(spor_settings)
     substance_name = "Test-substance"
     api_response = {
         "items": [{"smsId": "SUB-123", "name": substance_name}]
@@ -271,11 +602,10 @@ def test_search_substance_is_cached(spor_settings):
         assert mock_get.call_count == 1
 
 
-def test_search_substance_retries_on_failure(spor_settings):
+def test_search_substance_retries_on_failure(client, spor_settings):
     """
     Test that the client retries the search request on transient server errors.
     """
-    client = SporApiClient(spor_settings)
     substance_name = "Retry Substance"
     success_response = {
         "items": [{"smsId": "SUB-RETRY", "name": substance_name}]
@@ -301,3 +631,67 @@ def test_search_substance_retries_on_failure(spor_settings):
         assert mock_get.call_count == 2
         assert isinstance(result, SporSmsSubstance)
         assert result.sms_id == "SUB-RETRY"
+
+
+@pytest.mark.parametrize(
+    "search_method, path, cache_attr",
+    [
+        ("search_organisation", "oms/organisations", "_org_cache"),
+        ("search_substance", "sms/substances", "_substance_cache"),
+    ],
+)
+def test_failed_search_is_cached(
+    client, spor_settings, monkeypatch, search_method, path, cache_attr
+):
+    """
+    Test that a search failing after all retries is remembered, so the same
+    name is not looked up again during the run.
+    """
+    monkeypatch.setattr(SporApiClient._make_request.retry, "wait", wait_none())
+    name = "Unreachable"
+
+    with requests_mock.Mocker() as m:
+        m.post(
+            f"{spor_settings.base_url}/api/Account",
+            json={"result": {"accessToken": "fake-token"}},
+        )
+        mock_get = m.get(
+            f"{spor_settings.base_url}/api/v1/spor/{path}", status_code=503
+        )
+
+        assert getattr(client, search_method)(name) is None
+        attempts = mock_get.call_count
+        assert getattr(client, search_method)(name) is None
+
+        assert attempts == 4
+        assert mock_get.call_count == attempts
+        assert getattr(client, cache_attr)["unreachable"] is None
+
+
+def test_failed_search_expires_before_misses(spor_settings, monkeypatch):
+    """
+    Test that a search that failed is looked up again once `failure_cache_ttl`
+    has passed, while a genuine miss stays cached for `negative_cache_ttl`.
+    """
+    monkeypatch.setattr(SporApiClient._make_request.retry, "wait", wait_none())
+    client = SporApiClient(spor_settings.model_copy(update={"failure_cache_ttl": 0}))
+
+    def _respond(request, context):
+        if request.qs["name"][0] == "unreachable":
+            context.status_code = 503
+        return {"items": []}
+
+    with requests_mock.Mocker() as m:
+        m.post(
+            f"{spor_settings.base_url}/api/Account",
+            json={"result": {"accessToken": "fake-token"}},
+        )
+        mock_get = m.get(
+            f"{spor_settings.base_url}/api/v1/spor/oms/organisations", json=_respond
+        )
+
+        for name in ("Unreachable", "Unknown", "Unreachable", "Unknown"):
+            assert client.search_organisation(name) is None
+
+        looked_up = [r.qs["name"][0] for r in mock_get.request_history]
+        assert looked_up == ["unreachable"] * 4 + ["unknown"] + ["unreachable"] * 4
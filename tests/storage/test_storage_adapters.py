@@ -1,4 +1,8 @@
 import io
+import os
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import boto3
@@ -6,7 +10,7 @@ import pytest
 from moto import mock_aws
 
 from py_load_epar.storage.local import LocalStorage
-from py_load_epar.storage.s3 import S3Storage
+from py_load_epar.storage.s3 import S3Storage, reset_shared_clients
 
 # --- Tests for LocalStorage ---
 
@@ -26,23 +30,56 @@ def test_local_storage_save(tmp_path: Path):
     assert expected_path.read_bytes() == test_content
     assert storage_uri == expected_path.as_uri()
 
-def test_local_storage_creates_basedir():
+def test_local_storage_save_streams_without_buffering(tmp_path: Path):
+    """
+    Tests that LocalStorage copies a large stream to disk in blocks instead of
+    reading it into memory first.
+    """
+
+    class _ZeroStream(io.RawIOBase):
+        """A stream of zero bytes, served from one block as it is read."""
+
+        def __init__(self, size: int):
+            self._remaining = size
+            self._block = bytes(1024 * 1024)
+
+        def readable(self) -> bool:
+            return True
+
+        def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+            return 0
+
+        def read(self, size: int = -1) -> bytes:
+            size = min(size, len(self._block), self._remaining)
+            self._remaining -= size
+            return self._block if size == len(self._block) else bytes(size)
+
+    storage = LocalStorage(base_path=tmp_path)
+    size = 64 * 1024 * 1024
+    data_stream = _ZeroStream(size)
+
+    tracemalloc.start()
+    try:
+        storage.save(data_stream, "docs/large_document.pdf")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert (tmp_path / "docs/large_document.pdf").stat().st_size == size
+    assert peak < 4 * 1024 * 1024
+
+def test_local_storage_creates_basedir(tmp_path: Path):
     """
     Tests that LocalStorage creates the base directory if it doesn't exist.
     """
-    # Use a non-existent path
-    base_path = Path("./non_existent_dir_for_testing")
-    # Clean up before and after just in case
-    if base_path.exists():
-        base_path.rmdir()
+    # A non-existent path under the test's own temporary directory, so parallel
+    # test workers never share it.
+    base_path = tmp_path / "non_existent_dir_for_testing"
 
     assert not base_path.exists()
-    storage = LocalStorage(base_path=base_path)
+    LocalStorage(base_path=base_path)
     assert base_path.exists()
 
-    # Clean up
-    base_path.rmdir()
-
 
 def test_local_storage_create_basedir_permission_error(mocker):
     """
@@ -73,12 +110,20 @@ def test_local_storage_save_write_error(tmp_path: Path, mocker):
 
 # --- Tests for S3Storage ---
 
+@pytest.fixture
+def bucket_name() -> str:
+    """
+    Provides a mock S3 bucket name unique to the pytest-xdist worker, so tests
+    running in parallel never address the same bucket.
+    """
+    return f"test-epar-bucket-{os.environ.get('PYTEST_XDIST_WORKER', 'gw0')}"
+
+
 @mock_aws
-def test_s3_storage_save():
+def test_s3_storage_save(bucket_name: str):
     """
     Tests that S3Storage correctly uploads a file to a mock S3 bucket.
     """
-    bucket_name = "test-epar-bucket"
     region = "us-east-1"
 
     # Set up mock S3 environment
@@ -97,6 +142,77 @@ def test_s3_storage_save():
     assert response["Body"].read() == test_content
     assert storage_uri == f"s3://{bucket_name}/{object_name}"
 
+
+@mock_aws
+def test_s3_storage_uploads_large_files_in_parts(bucket_name: str):
+    """
+    Tests that S3Storage uploads files above the multipart threshold in parts.
+    """
+    region = "us-east-1"
+    s3_client = boto3.client("s3", region_name=region)
+    s3_client.create_bucket(Bucket=bucket_name)
+
+    storage = S3Storage(bucket_name=bucket_name, region_name=region)
+    test_content = bytes(range(256)) * (64 * 1024)  # 16 MiB
+    object_name = "docs/large_document.pdf"
+
+    storage.save(io.BytesIO(test_content), object_name)
+
+    response = s3_client.get_object(Bucket=bucket_name, Key=object_name)
+    assert response["Body"].read() == test_content
+    # Multipart uploads get an ETag suffixed with their number of parts.
+    assert response["ETag"].strip('"').endswith("-2")
+
+
+@mock_aws
+def test_s3_storage_streams_non_seekable_uploads_with_bounded_buffers(
+    bucket_name: str, mocker
+):
+    """
+    Tests that S3Storage uploads a forward-only stream, like a document being
+    downloaded, in parts while buffering only a few of them at a time, even
+    though each read of the stream returns less than a part.
+    """
+
+    class _ForwardOnlyStream(io.RawIOBase):
+        """A non-seekable stream served in 1 MiB reads, like a download."""
+
+        def __init__(self, content: bytes):
+            self._content = io.BytesIO(content)
+
+        def readable(self) -> bool:
+            return True
+
+        def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+            if whence == io.SEEK_SET and offset == self._content.tell() == 0:
+                return 0
+            raise io.UnsupportedOperation("not seekable")
+
+        def readinto(self, b) -> int:
+            data = self._content.read(min(len(b), 1024 * 1024))
+            b[: len(data)] = data
+            return len(data)
+
+    region = "us-east-1"
+    s3_client = boto3.client("s3", region_name=region)
+    s3_client.create_bucket(Bucket=bucket_name)
+
+    storage = S3Storage(bucket_name=bucket_name, region_name=region)
+    upload = mocker.spy(storage.s3_client, "upload_fileobj")
+    test_content = bytes(range(256)) * (80 * 1024)  # 20 MiB, in three parts
+    object_name = "docs/streamed_document.pdf"
+
+    stream = _ForwardOnlyStream(test_content)
+    storage.save(stream, object_name)
+
+    assert not stream.closed
+    config = upload.call_args.kwargs["Config"]
+    assert config.max_request_concurrency == 2
+    assert config.max_in_memory_upload_chunks == 2
+    response = s3_client.get_object(Bucket=bucket_name, Key=object_name)
+    assert response["Body"].read() == test_content
+    assert response["ETag"].strip('"').endswith("-3")
+
 from botocore.exceptions import ClientError
 
 
@@ -122,6 +238,61 @@ def test_s3_storage_raises_error_on_failure(mocker):
     with pytest.raises(IOError, match="S3 upload failed"):
         storage.save(io.BytesIO(b"test"), "any_object")
 
+def test_s3_storage_shares_client_per_region(mocker):
+    """
+    Tests that S3Storage instances in the same region reuse one boto3 client,
+    and that an injected client is used as given.
+    """
+    first = S3Storage(bucket_name="bucket-a", region_name="eu-west-1")
+    second = S3Storage(bucket_name="bucket-b", region_name="eu-west-1")
+    other_region = S3Storage(bucket_name="bucket-c", region_name="eu-central-1")
+    injected_client = mocker.Mock()
+    injected = S3Storage(bucket_name="bucket-d", s3_client=injected_client)
+
+    assert first.s3_client is second.s3_client
+    assert other_region.s3_client is not first.s3_client
+    assert other_region.s3_client.meta.region_name == "eu-central-1"
+    assert injected.s3_client is injected_client
+
+
+def test_s3_storage_shared_clients_can_be_reset():
+    """
+    Tests that resetting the shared S3 clients makes the next S3Storage build a
+    new client.
+    """
+    first = S3Storage(bucket_name="bucket-a", region_name="eu-west-1")
+
+    reset_shared_clients()
+    second = S3Storage(bucket_name="bucket-b", region_name="eu-west-1")
+
+    assert second.s3_client is not first.s3_client
+
+
+def test_s3_storage_builds_one_client_for_concurrent_callers(mocker):
+    """
+    Tests that S3Storage instances created concurrently in one region share a
+    single client rather than each building their own.
+    """
+
+    def _slow_client(*args, **kwargs):
+        time.sleep(0.05)
+        return mocker.Mock()
+
+    build_client = mocker.patch(
+        "py_load_epar.storage.s3.boto3.client", side_effect=_slow_client
+    )
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        storages = list(
+            executor.map(
+                lambda i: S3Storage(bucket_name=f"bucket-{i}", region_name="eu-west-1"),
+                range(4),
+            )
+        )
+
+    build_client.assert_called_once_with("s3", region_name="eu-west-1")
+    assert len({id(storage.s3_client) for storage in storages}) == 1
+
 def test_s3_storage_requires_bucket():
     """
     Tests that S3Storage raises ValueError if no bucket name is provided.
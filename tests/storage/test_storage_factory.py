@@ -43,3 +43,24 @@ def test_storage_factory_raises_error_for_unsupported_backend():
 
     with pytest.raises(ValueError, match="Unsupported storage backend: 'ftp'"):
         factory.get_storage()
+
+
+def test_storage_factory_shares_adapters_per_configuration(tmp_path: Path):
+    """
+    Tests that factories with the same configuration return one shared adapter,
+    and that a different configuration or a reset gives a new one.
+    """
+    settings = StorageSettings(backend="local", local_storage_path=str(tmp_path))
+    storage = StorageFactory(settings=settings).get_storage()
+
+    assert StorageFactory(settings=settings.model_copy()).get_storage() is storage
+
+    for changes in (
+        {"local_storage_path": str(tmp_path / "other")},
+        {"s3_region": "eu-west-1"},
+    ):
+        other_settings = settings.model_copy(update=changes)
+        assert StorageFactory(settings=other_settings).get_storage() is not storage
+
+    StorageFactory.reset()
+    assert StorageFactory(settings=settings).get_storage() is not storage
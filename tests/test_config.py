@@ -1,3 +1,4 @@
+import json
 import os
 from unittest.mock import patch
 
@@ -59,6 +60,19 @@ def test_load_from_yaml(tmp_path):
     assert settings.db.user == "user"
 
 
+def test_load_from_json(tmp_path):
+    """Test that a config file ending in .json is read as JSON."""
+    config_file = tmp_path / "config.json"
+    config_file.write_text(
+        json.dumps({"db": {"host": "json_host"}, "etl": {"batch_size": 50}})
+    )
+
+    settings = Settings(config_path=str(config_file))
+
+    assert settings.db.host == "json_host"
+    assert settings.etl.batch_size == 50
+
+
 @patch.dict(os.environ, {"DB__HOST": "env_host"})
 def test_env_vars_override_yaml(tmp_path):
     """Test that environment variables take precedence over YAML file settings."""
@@ -72,6 +86,25 @@ def test_env_vars_override_yaml(tmp_path):
     assert settings.db.host == "env_host"
 
 
+def test_yaml_is_parsed_once_until_the_file_changes(tmp_path, mocker):
+    """Test that an unchanged YAML file is parsed once and an edited one again."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(yaml.dump({"db": {"host": "first_host"}}))
+    load_spy = mocker.spy(yaml, "load")
+
+    Settings(config_path=str(config_file))
+    settings = Settings(config_path=str(config_file))
+    assert settings.db.host == "first_host"
+    assert load_spy.call_count == 1
+
+    config_file.write_text(yaml.dump({"db": {"host": "second_host"}}))
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert Settings(config_path=str(config_file)).db.host == "second_host"
+    assert load_spy.call_count == 2
+
+
 def test_database_dsn_property():
     """Test the DSN property of the DatabaseSettings."""
     db_settings = DatabaseSettings(